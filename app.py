@@ -3,11 +3,16 @@ TalentScout Hiring Assistant - Main Streamlit Application
 Supports multiple LLM providers: Groq, OpenAI, HuggingFace
 """
 
+import itertools
+from collections import deque
+
 import streamlit as st
 from chatbot import HiringAssistant
-from llm_providers import LLMProviderFactory
-from utils import format_tech_stack_display, mask_sensitive_data
-from config import APP_TITLE, APP_ICON, ConversationState, LLMProvider
+from llm_providers import LLMProviderFactory, BaseLLMProvider
+from utils import configure_logging, format_tech_stack_display, mask_sensitive_data
+from config import APP_TITLE, APP_ICON, MAX_CHAT_MESSAGES, ConversationState, LLMProvider
+
+configure_logging()
 
 # Page configuration
 st.set_page_config(
@@ -17,8 +22,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# =============================================================================
+# Static UI Content
+# =============================================================================
+
 # Custom CSS for better UI
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     /* Main container styling */
     .main-header {
@@ -110,155 +119,265 @@ st.markdown("""
         margin: 2rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+HEADER_HTML = """
+<div class="main-header">
+    <h1>🎯 TalentScout</h1>
+    <p>AI-Powered Hiring Assistant</p>
+</div>
+"""
+
+WELCOME_HTML = """
+<div class="welcome-box">
+    <h2>👋 Welcome to TalentScout!</h2>
+    <p>Your AI-powered hiring assistant</p>
+</div>
+"""
+
+INFO_CARDS = (
+    (
+        """
+        📝 **Information Gathering**
+        - Basic contact details
+        - Professional experience
+        - Desired position
+        """,
+        """
+        💻 **Technical Assessment**
+        - Skills-based questions
+        - Tailored to your tech stack
+        - 3-5 questions total
+        """,
+    ),
+    (
+        """
+        ⏱️ **Time Required**
+        - About 5-10 minutes
+        - Go at your own pace
+        - Exit anytime with 'quit'
+        """,
+        """
+        🔒 **Privacy First**
+        - Secure data handling
+        - GDPR compliant
+        - Data used only for screening
+        """,
+    ),
+)
+
+HELP_MARKDOWN = """
+            **Tips for candidates:**
+            - Answer questions clearly and completely
+            - Be specific about your tech stack
+            - Take your time with technical questions
+            
+            **Commands:**
+            - Type `exit`, `quit`, or `bye` to end
+            
+            **Privacy:**
+            - Your data is handled securely
+            - Sensitive info is masked in the UI
+            """
+
+NEXT_STEPS_MARKDOWN = """
+    **What happens next?**
+    1. Our recruitment team will review your profile
+    2. You'll receive an email within 3-5 business days
+    3. If selected, we'll schedule a detailed interview
+    """
+
+# Sidebar stage labels for each conversation state
+STAGE_NAMES = {
+    ConversationState.GREETING: "👋 Welcome",
+    ConversationState.COLLECTING_NAME: "📝 Name",
+    ConversationState.COLLECTING_EMAIL: "📧 Email",
+    ConversationState.COLLECTING_PHONE: "📱 Phone",
+    ConversationState.COLLECTING_EXPERIENCE: "💼 Experience",
+    ConversationState.COLLECTING_POSITION: "🎯 Position",
+    ConversationState.COLLECTING_LOCATION: "📍 Location",
+    ConversationState.COLLECTING_TECH_STACK: "💻 Tech Stack",
+    ConversationState.TECHNICAL_QUESTIONS: "❓ Technical Q&A",
+    ConversationState.COMPLETED: "✅ Complete"
+}
+
+# CSS class for each provider badge
+PROVIDER_CLASSES = {
+    "Groq": "provider-groq",
+    "OpenAI": "provider-openai",
+    "HuggingFace": "provider-huggingface",
+    "Fallback (No API)": "provider-fallback"
+}
+
+PROVIDER_BADGE_HTML = {
+    name: f'<span class="provider-badge {css_class}">🤖 {name}</span>'
+    for name, css_class in PROVIDER_CLASSES.items()
+}
+
+# Streamlit only keeps elements emitted during the current run, so the
+# stylesheet has to be written again on every rerun.
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm_provider(provider: str = "auto") -> BaseLLMProvider:
+    """
+    Create an LLM provider once per process and share it across sessions.
+    
+    Provider construction initializes the SDK clients, so it is kept out of
+    the per-session HiringAssistant which only holds conversation state.
+    
+    Args:
+        provider: Provider name ('groq', 'openai', 'huggingface', or 'auto')
+        
+    Returns:
+        BaseLLMProvider: The shared provider instance
+    """
+    return LLMProviderFactory.create(provider)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_available_providers() -> list:
+    """Get provider availability status, cached for 5 minutes across reruns."""
+    return LLMProviderFactory.get_available_providers()
+
+
+# Factories for per-session state, only called when a key is missing
+SESSION_DEFAULTS = {
+    "chatbot": lambda: HiringAssistant(llm_provider=get_llm_provider()),
+    "messages": lambda: deque(maxlen=MAX_CHAT_MESSAGES),
+    "conversation_started": lambda: False,
+    "conversation_ended": lambda: False,
+    "balloons_shown": lambda: False,
+}
 
 
 def initialize_session_state():
     """Initialize session state variables."""
-    if 'chatbot' not in st.session_state:
-        st.session_state.chatbot = HiringAssistant()
-    if 'messages' not in st.session_state:
-        st.session_state.messages = []
-    if 'conversation_started' not in st.session_state:
-        st.session_state.conversation_started = False
-    if 'conversation_ended' not in st.session_state:
-        st.session_state.conversation_ended = False
+    for key, factory in SESSION_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = factory()
 
 
 def display_header():
     """Display the application header."""
-    st.markdown("""
-        <div class="main-header">
-            <h1>🎯 TalentScout</h1>
-            <p>AI-Powered Hiring Assistant</p>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 
 def get_provider_badge(provider_name: str) -> str:
     """Get HTML badge for the current provider."""
-    provider_classes = {
-        "Groq": "provider-groq",
-        "OpenAI": "provider-openai",
-        "HuggingFace": "provider-huggingface",
-        "Fallback (No API)": "provider-fallback"
-    }
-    
-    css_class = provider_classes.get(provider_name, "provider-fallback")
-    return f'<span class="provider-badge {css_class}">🤖 {provider_name}</span>'
+    badge = PROVIDER_BADGE_HTML.get(provider_name)
+    if badge is None:
+        badge = f'<span class="provider-badge provider-fallback">🤖 {provider_name}</span>'
+    return badge
 
 
 def display_sidebar():
     """Display sidebar with progress, provider info, and controls."""
     with st.sidebar:
-        # Provider info
-        st.markdown("### 🔌 LLM Provider")
-        provider_name = st.session_state.chatbot.get_provider_name()
-        st.markdown(get_provider_badge(provider_name), unsafe_allow_html=True)
-        
-        # Provider selector
-        available_providers = LLMProviderFactory.get_available_providers()
-        provider_options = ["auto"] + [p["name"] for p in available_providers if p["available"]]
+        display_sidebar_content()
+
+
+@st.fragment
+def display_sidebar_content():
+    """
+    Render the sidebar body as a fragment.
+    
+    Sidebar widgets (provider selector, expanders) only rerun this fragment
+    instead of the whole app. Full app reruns still refresh it.
+    """
+    # Provider info
+    st.markdown("### 🔌 LLM Provider")
+    provider_name = st.session_state.chatbot.get_provider_name()
+    st.markdown(get_provider_badge(provider_name), unsafe_allow_html=True)
+    
+    # Provider selector
+    available_providers = get_available_providers()
+    provider_options = ["auto"] + [p["name"] for p in available_providers if p["available"]]
+    
+    if len(provider_options) > 1:
+        selected_provider = st.selectbox(
+            "Switch Provider",
+            options=provider_options,
+            index=0,
+            key="provider_selector",
+            help="Select which LLM provider to use"
+        )
         
-        if len(provider_options) > 1:
-            selected_provider = st.selectbox(
-                "Switch Provider",
-                options=provider_options,
-                index=0,
-                key="provider_selector",
-                help="Select which LLM provider to use"
+        if st.button("Apply", use_container_width=True, key="apply_provider_btn"):
+            st.session_state.chatbot.switch_provider(
+                selected_provider, get_llm_provider(selected_provider)
             )
-            
-            if st.button("Apply", use_container_width=True, key="apply_provider_btn"):
-                st.session_state.chatbot.switch_provider(selected_provider)
-                st.rerun()
-        
-        # Show available providers status
-        with st.expander("📋 Provider Status"):
-            for provider in available_providers:
-                status = "✅" if provider["available"] else "❌"
-                st.write(f"{status} {provider['display_name']}")
-        
-        st.markdown("---")
-        
-        # Progress section
-        st.markdown("### 📊 Screening Progress")
-        
-        progress = st.session_state.chatbot.get_progress()
-        
-        # Progress bar
-        st.progress(progress['percentage'] / 100)
-        st.caption(f"Step {progress['current_step']} of {progress['total_steps']}")
-        
-        # Current stage indicator
-        stage_names = {
-            ConversationState.GREETING: "👋 Welcome",
-            ConversationState.COLLECTING_NAME: "📝 Name",
-            ConversationState.COLLECTING_EMAIL: "📧 Email",
-            ConversationState.COLLECTING_PHONE: "📱 Phone",
-            ConversationState.COLLECTING_EXPERIENCE: "💼 Experience",
-            ConversationState.COLLECTING_POSITION: "🎯 Position",
-            ConversationState.COLLECTING_LOCATION: "📍 Location",
-            ConversationState.COLLECTING_TECH_STACK: "💻 Tech Stack",
-            ConversationState.TECHNICAL_QUESTIONS: "❓ Technical Q&A",
-            ConversationState.COMPLETED: "✅ Complete"
-        }
-        
-        current_stage = stage_names.get(progress['current_state'], "In Progress")
-        st.info(f"**Current:** {current_stage}")
-        
-        st.markdown("---")
-        
-        # Collected information
-        st.markdown("### 📋 Candidate Info")
-        candidate = st.session_state.chatbot.candidate_info
-        
-        info_items = [
-            ("👤 Name", candidate.get('name')),
-            ("📧 Email", mask_sensitive_data(candidate.get('email', ''), 'email') if candidate.get('email') else None),
-            ("📱 Phone", mask_sensitive_data(candidate.get('phone', ''), 'phone') if candidate.get('phone') else None),
-            ("💼 Experience", f"{candidate.get('experience_years')} years" if candidate.get('experience_years') is not None else None),
-            ("🎯 Position", candidate.get('desired_position')),
-            ("📍 Location", candidate.get('location')),
-        ]
-        
-        for label, value in info_items:
-            if value:
-                st.markdown(f"**{label}:** {value}")
-        
-        if candidate.get('tech_stack'):
-            st.markdown("**💻 Tech Stack:**")
-            st.caption(format_tech_stack_display(candidate['tech_stack']))
-        
-        st.markdown("---")
-        
-        # Reset button in sidebar
-        if st.button("🔄 Start New Screening", use_container_width=True, key="sidebar_reset_btn"):
-            reset_conversation()
-        
-        # Help section
-        with st.expander("ℹ️ Help & Tips"):
-            st.markdown("""
-            **Tips for candidates:**
-            - Answer questions clearly and completely
-            - Be specific about your tech stack
-            - Take your time with technical questions
-            
-            **Commands:**
-            - Type `exit`, `quit`, or `bye` to end
-            
-            **Privacy:**
-            - Your data is handled securely
-            - Sensitive info is masked in the UI
-            """)
+            get_available_providers.clear()
+            st.rerun(scope="fragment")
+    
+    # Show available providers status
+    with st.expander("📋 Provider Status"):
+        for provider in available_providers:
+            status = "✅" if provider["available"] else "❌"
+            st.write(f"{status} {provider['display_name']}")
+    
+    st.markdown("---")
+    
+    # Progress section
+    st.markdown("### 📊 Screening Progress")
+    
+    progress = st.session_state.chatbot.get_progress()
+    
+    # Progress bar
+    st.progress(progress['percentage'] / 100)
+    st.caption(f"Step {progress['current_step']} of {progress['total_steps']}")
+    
+    # Current stage indicator
+    current_stage = STAGE_NAMES.get(progress['current_state'], "In Progress")
+    st.info(f"**Current:** {current_stage}")
+    
+    st.markdown("---")
+    
+    # Collected information
+    st.markdown("### 📋 Candidate Info")
+    candidate = st.session_state.chatbot.candidate_info
+    
+    info_items = [
+        ("👤 Name", candidate.get('name')),
+        ("📧 Email", mask_sensitive_data(candidate.get('email', ''), 'email') if candidate.get('email') else None),
+        ("📱 Phone", mask_sensitive_data(candidate.get('phone', ''), 'phone') if candidate.get('phone') else None),
+        ("💼 Experience", f"{candidate.get('experience_years')} years" if candidate.get('experience_years') is not None else None),
+        ("🎯 Position", candidate.get('desired_position')),
+        ("📍 Location", candidate.get('location')),
+    ]
+    
+    info_lines = [f"**{label}:** {value}" for label, value in info_items if value]
+    if candidate.get('tech_stack'):
+        info_lines.append("**💻 Tech Stack:**")
+    
+    # Single markdown element for all collected fields
+    if info_lines:
+        st.markdown("\n\n".join(info_lines))
+    
+    if candidate.get('tech_stack'):
+        st.caption(format_tech_stack_display(candidate['tech_stack']))
+    
+    st.markdown("---")
+    
+    # Reset button in sidebar
+    if st.button("🔄 Start New Screening", use_container_width=True, key="sidebar_reset_btn"):
+        reset_conversation()
+    
+    # Help section
+    with st.expander("ℹ️ Help & Tips"):
+        st.markdown(HELP_MARKDOWN)
 
 
 def reset_conversation():
     """Reset the conversation state."""
     st.session_state.chatbot.reset_conversation()
-    st.session_state.messages = []
+    # Don't keep the previous candidate's contact details in the memo caches
+    mask_sensitive_data.cache_clear()
+    st.session_state.messages = deque(maxlen=MAX_CHAT_MESSAGES)
     st.session_state.conversation_started = False
     st.session_state.conversation_ended = False
+    st.session_state.balloons_shown = False
     st.rerun()
 
 
@@ -281,10 +400,21 @@ def handle_user_input(user_input: str):
         "role": "user",
         "content": user_input
     })
+    with st.chat_message("user"):
+        st.markdown(user_input)
     
-    # Get chatbot response
-    with st.spinner("Thinking..."):
-        response, is_ended = st.session_state.chatbot.process_input(user_input)
+    # Stream chatbot response as it is generated
+    with st.chat_message("assistant"):
+        stream = st.session_state.chatbot.stream_input(user_input)
+        
+        # Some turns (e.g. question generation) do a full LLM call before the
+        # first chunk, so show a status until it arrives, then remove it
+        status_placeholder = st.empty()
+        with status_placeholder.status("Thinking...", expanded=False):
+            first_chunk = next(stream, "")
+        status_placeholder.empty()
+        
+        response = st.write_stream(itertools.chain([first_chunk], stream))
     
     # Add assistant response to chat
     st.session_state.messages.append({
@@ -293,72 +423,56 @@ def handle_user_input(user_input: str):
     })
     
     # Check if conversation ended
-    if is_ended:
+    if st.session_state.chatbot.conversation_ended:
         st.session_state.conversation_ended = True
 
 
 def display_welcome_screen():
-    """Display the welcome screen before conversation starts."""
-    st.markdown("""
-    <div class="welcome-box">
-        <h2>👋 Welcome to TalentScout!</h2>
-        <p>Your AI-powered hiring assistant</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        if st.button("🚀 Start Screening Process", use_container_width=True, type="primary", key="start_screening_btn"):
-            # Get greeting from chatbot
-            with st.spinner("Initializing..."):
-                greeting = st.session_state.chatbot.get_greeting()
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": greeting
-            })
-            st.session_state.conversation_started = True
-            st.rerun()
-    
-    # Information cards
-    st.markdown("### What to expect:")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        📝 **Information Gathering**
-        - Basic contact details
-        - Professional experience
-        - Desired position
-        """)
-        
-        st.markdown("""
-        💻 **Technical Assessment**
-        - Skills-based questions
-        - Tailored to your tech stack
-        - 3-5 questions total
-        """)
+    """
+    Display the welcome screen before conversation starts.
     
-    with col2:
-        st.markdown("""
-        ⏱️ **Time Required**
-        - About 5-10 minutes
-        - Go at your own pace
-        - Exit anytime with 'quit'
-        """)
+    When the start button is clicked the welcome screen clears itself so
+    the chat can be rendered in the same run instead of a second rerun.
+    """
+    welcome_placeholder = st.empty()
+    
+    with welcome_placeholder.container():
+        st.markdown(WELCOME_HTML, unsafe_allow_html=True)
         
-        st.markdown("""
-        🔒 **Privacy First**
-        - Secure data handling
-        - GDPR compliant
-        - Data used only for screening
-        """)
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            started = st.button("🚀 Start Screening Process", use_container_width=True, type="primary", key="start_screening_btn")
+        
+        if not started:
+            # Information cards
+            st.markdown("### What to expect:")
+            
+            for column, cards in zip(st.columns(2), INFO_CARDS):
+                with column:
+                    for card in cards:
+                        st.markdown(card)
+            return
+    
+    welcome_placeholder.empty()
+    
+    # Get greeting from chatbot
+    with st.spinner("Initializing..."):
+        greeting = st.session_state.chatbot.get_greeting()
+    st.session_state.messages.append({
+        "role": "assistant",
+        "content": greeting
+    })
+    st.session_state.conversation_started = True
 
 
 def display_completion_screen():
     """Display the completion screen."""
     st.success("✅ Screening Complete!")
-    st.balloons()
+    
+    # Celebrate once, not on every rerun of the completion screen
+    if not st.session_state.balloons_shown:
+        st.balloons()
+        st.session_state.balloons_shown = True
     
     # Summary
     candidate = st.session_state.chatbot.candidate_info
@@ -367,34 +481,32 @@ def display_completion_screen():
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("**Personal Information**")
-            st.write(f"- **Name:** {candidate.get('name', 'N/A')}")
-            st.write(f"- **Location:** {candidate.get('location', 'N/A')}")
-            st.write(f"- **Experience:** {candidate.get('experience_years', 'N/A')} years")
+            st.markdown(
+                "**Personal Information**\n\n"
+                f"- **Name:** {candidate.get('name', 'N/A')}\n"
+                f"- **Location:** {candidate.get('location', 'N/A')}\n"
+                f"- **Experience:** {candidate.get('experience_years', 'N/A')} years"
+            )
         
         with col2:
-            st.markdown("**Professional Details**")
-            st.write(f"- **Position:** {candidate.get('desired_position', 'N/A')}")
-            tech_stack_raw = candidate.get('tech_stack_raw', 'N/A')
-            if tech_stack_raw and len(tech_stack_raw) > 50:
-                tech_stack_raw = tech_stack_raw[:50] + "..."
-            st.write(f"- **Tech Stack:** {tech_stack_raw}")
+            st.markdown(
+                "**Professional Details**\n\n"
+                f"- **Position:** {candidate.get('desired_position', 'N/A')}\n"
+                f"- **Tech Stack:** {st.session_state.chatbot.tech_stack_display or 'N/A'}"
+            )
     
     # Technical Q&A Summary
     if candidate.get('technical_answers'):
         with st.expander("📝 Technical Q&A Summary"):
-            for i, qa in enumerate(candidate['technical_answers'], 1):
-                st.markdown(f"**Q{i}:** {qa['question']}")
-                st.markdown(f"**A:** {qa['answer'][:200]}{'...' if len(qa['answer']) > 200 else ''}")
-                st.markdown("---")
+            answer_previews = st.session_state.chatbot.answer_previews
+            qa_blocks = [
+                f"**Q{i}:** {qa['question']}\n\n**A:** {answer}\n\n---"
+                for i, (qa, answer) in enumerate(zip(candidate['technical_answers'], answer_previews), 1)
+            ]
+            st.markdown("\n\n".join(qa_blocks))
     
     # Next steps
-    st.info("""
-    **What happens next?**
-    1. Our recruitment team will review your profile
-    2. You'll receive an email within 3-5 business days
-    3. If selected, we'll schedule a detailed interview
-    """)
+    st.info(NEXT_STEPS_MARKDOWN)
     
     # Action button - using unique key
     if st.button("🔄 Start New Screening", use_container_width=True, key="completion_reset_btn"):
@@ -409,19 +521,19 @@ def main():
     # Display header
     display_header()
     
-    # Display sidebar
-    display_sidebar()
-    
     # Main content area
     if not st.session_state.conversation_started:
         display_welcome_screen()
-    elif st.session_state.conversation_ended:
+    
+    # The start button may have begun the conversation during this run, in
+    # which case the chat is rendered straight away
+    if st.session_state.conversation_ended:
         # Show chat history
         st.markdown("### 💬 Conversation History")
         display_chat()
         st.markdown("---")
         display_completion_screen()
-    else:
+    elif st.session_state.conversation_started:
         # Active conversation
         st.markdown("### 💬 Chat with our Hiring Assistant")
         
@@ -430,8 +542,15 @@ def main():
         
         # Chat input
         if user_input := st.chat_input("Type your response here...", key="chat_input"):
+            # The new messages are rendered in place by handle_user_input, so
+            # the history doesn't need replaying; only rerun to switch to the
+            # completion screen
             handle_user_input(user_input)
-            st.rerun()
+            if st.session_state.conversation_ended:
+                st.rerun()
+    
+    # Display sidebar last so it reflects state changes made during this run
+    display_sidebar()
 
 
 if __name__ == "__main__":
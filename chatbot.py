@@ -3,21 +3,232 @@ Core chatbot logic for TalentScout Hiring Assistant
 Updated to support multiple LLM providers (Groq, OpenAI, HuggingFace)
 """
 
-from typing import Dict, Any, List, Tuple, Optional
-from config import ConversationState, EXIT_KEYWORDS
+import asyncio
+import logging
+import re
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import (
+    TYPE_CHECKING, Dict, Any, List, Tuple, Optional, Iterable, Iterator,
+    NamedTuple, Union
+)
+from config import (
+    ConversationState, EXIT_KEYWORDS,
+    NUM_TECHNICAL_QUESTIONS, MAX_CONVERSATION_HISTORY, COMPLETION_PREFETCH_TIMEOUT,
+    RESPONSE_CACHE_SIZE, RESPONSE_CACHE_FILE,
+    SEMANTIC_CACHE_ENABLED, SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_SIZE
+)
 from prompts import (
-    SYSTEM_PROMPT, GREETING_PROMPT, COLLECT_EMAIL_PROMPT,
-    COLLECT_PHONE_PROMPT, COLLECT_EXPERIENCE_PROMPT,
-    COLLECT_POSITION_PROMPT, COLLECT_LOCATION_PROMPT,
-    COLLECT_TECH_STACK_PROMPT, GENERATE_QUESTIONS_PROMPT,
-    COMPLETION_PROMPT, FALLBACK_PROMPT, OFFTOPIC_REDIRECT_PROMPT
+    SYSTEM_PROMPT_STATIC, SYSTEM_PROMPT_PREFIX, GREETING_PROMPT,
+    COLLECT_EXPERIENCE_PROMPT, COLLECT_TECH_STACK_PROMPT,
+    GENERATE_QUESTIONS_PROMPT, COMPLETION_PROMPT,
+    FALLBACK_PROMPT, OFFTOPIC_REDIRECT_PROMPT,
+    FMT_SYSTEM_PROMPT_DYNAMIC_SUFFIX, FMT_COLLECT_EMAIL, FMT_COLLECT_PHONE,
+    FMT_COLLECT_POSITION, FMT_COLLECT_LOCATION, FMT_GENERATE_QUESTIONS
 )
 from utils import (
     validate_email, validate_phone, validate_experience,
     is_exit_command, extract_tech_stack, save_candidate_data,
-    sanitize_input
+    sanitize_input, normalize_tech_stack, truncate_for_display
+)
+from response_cache import ResponseCache, SemanticCache
+
+if TYPE_CHECKING:
+    from llm_providers import BaseLLMProvider
+
+logger = logging.getLogger("talentscout.chatbot")
+
+class LLMReply(NamedTuple):
+    """
+    A reply that still needs an LLM call.
+    
+    State handlers return this instead of calling the LLM directly so the
+    caller can decide whether to block on the full response or stream it.
+    The system message and state are captured when the reply is created.
+    """
+    prompt: str
+    system_msg: str
+    state: str
+    cache_key: Optional[tuple] = None
+
+
+# LLM output that doesn't depend on who the candidate is (the greeting, and
+# questions for a given stack/position/experience) is shared across sessions.
+# Candidate-specific replies are never cached: their prompts embed the
+# candidate's details, so a near-match would hand one candidate another's text.
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_FILE)
+
+# Catches question sets for reworded profiles that miss the exact cache
+semantic_cache = (
+    SemanticCache(SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_SIZE)
+    if SEMANTIC_CACHE_ENABLED else None
+)
+
+# Runs LLM calls made ahead of time (the closing message) for all sessions
+_prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-prefetch")
+
+# Canned reply for each state, used when the LLM is unavailable or fails
+FALLBACK_RESPONSES = {
+    ConversationState.GREETING: (
+        "👋 Welcome to TalentScout! I'm your AI hiring assistant.\n\n"
+        "I'll help guide you through our initial screening process. "
+        "This will take about 5-10 minutes.\n\n"
+        "**Let's start! What is your full name?**"
+    ),
+    ConversationState.COLLECTING_NAME: (
+        "Nice to meet you! 😊\n\n"
+        "Could you please provide your **email address**?"
+    ),
+    ConversationState.COLLECTING_EMAIL: (
+        "Great, thank you!\n\n"
+        "What's the best **phone number** to reach you?"
+    ),
+    ConversationState.COLLECTING_PHONE: (
+        "Perfect!\n\n"
+        "How many **years of experience** do you have in the tech industry?"
+    ),
+    ConversationState.COLLECTING_EXPERIENCE: (
+        "Excellent experience!\n\n"
+        "What **position(s)** are you interested in applying for?\n"
+        "(e.g., Software Engineer, Full Stack Developer, Data Scientist)"
+    ),
+    ConversationState.COLLECTING_POSITION: (
+        "Great choice!\n\n"
+        "What is your **current location**? (City, Country)"
+    ),
+    ConversationState.COLLECTING_LOCATION: (
+        "Thank you!\n\n"
+        "Now, please list your **tech stack** including:\n"
+        "• Programming languages\n"
+        "• Frameworks\n"
+        "• Databases\n"
+        "• Tools & technologies\n\n"
+        "Be as specific as possible - this helps us generate relevant questions!"
+    ),
+    ConversationState.TECHNICAL_QUESTIONS: (
+        "Thank you for your answer! Let me ask the next question."
+    ),
+    ConversationState.COMPLETED: (
+        "🎉 **Thank you for completing the screening!**\n\n"
+        "Your information has been recorded successfully. "
+        "Our recruitment team will review your profile and "
+        "contact you within **3-5 business days**.\n\n"
+        "We appreciate your interest in joining through TalentScout. "
+        "Good luck! 🍀"
+    )
+}
+
+DEFAULT_FALLBACK_RESPONSE = (
+    "I apologize, but I'm having trouble processing that. Could you please try again?"
+)
+
+# Asked when nothing in the tech stack matches, and used to top up short sets
+GENERAL_FALLBACK_QUESTIONS = (
+    "Describe a challenging technical problem you solved recently. What was your approach?",
+    "How do you ensure code quality in your projects? What practices do you follow?",
+    "Explain your experience with version control systems and collaborative development.",
+    "How do you approach learning new technologies or frameworks?",
+    "Describe your debugging process when encountering a difficult bug."
+)
+
+# Topic questions for when generation fails, in the order they're asked,
+# each with the tech keywords that select it
+FALLBACK_BUCKETS = (
+    # Python questions
+    (frozenset({"python"}), (
+        "Explain the difference between a list and a tuple in Python. When would you use each?",
+        "What are Python decorators and can you give an example of when you'd use one?",
+        "How does Python's garbage collection work? What is reference counting?"
+    )),
+    # JavaScript/Frontend questions
+    (frozenset({"javascript", "react", "angular", "vue", "node"}), (
+        "Explain the concept of closures in JavaScript with a practical example.",
+        "What is the event loop in JavaScript and how does it handle asynchronous operations?",
+        "Describe the difference between '==' and '===' in JavaScript."
+    )),
+    # React specific
+    (frozenset({"react"}), (
+        "Explain the Virtual DOM in React and how it improves performance.",
+        "What are React Hooks? Explain useState and useEffect with examples.",
+        "How do you handle state management in large React applications?"
+    )),
+    # Database questions
+    (frozenset({"sql", "mysql", "sqlite", "mssql", "postgresql", "postgres", "nosql",
+                "database", "mongodb"}), (
+        "Explain the difference between SQL and NoSQL databases. When would you choose one over the other?",
+        "What are database indexes and how do they improve query performance?",
+        "Describe ACID properties in databases and why they're important."
+    )),
+    # DevOps/Cloud questions
+    (frozenset({"docker", "kubernetes", "aws", "azure", "devops"}), (
+        "Explain the difference between containers and virtual machines.",
+        "What is CI/CD and why is it important in modern software development?",
+        "Describe your experience with cloud services and infrastructure as code."
+    )),
+    # Java questions
+    (frozenset({"java"}), (
+        "Explain the difference between an abstract class and an interface in Java.",
+        "What is the Java Virtual Machine (JVM) and how does it work?",
+        "Describe the concept of multithreading in Java and how you handle synchronization."
+    )),
+    # Machine Learning questions
+    (frozenset({"machine learning", "ml", "tensorflow", "pytorch", "data science"}), (
+        "Explain the difference between supervised and unsupervised learning with examples.",
+        "What is overfitting and how do you prevent it?",
+        "Describe a machine learning project you've worked on and the challenges you faced."
+    )),
 )
-from llm_providers import LLMProviderFactory, BaseLLMProvider
+
+# One pass over the tech stack finds every bucket keyword. Whole words only,
+# so "javascript" isn't Java and "html" isn't ML; an optional "js"/".js"
+# suffix or version number keeps "reactjs", "node.js" and "python3" matching
+FALLBACK_PATTERN = re.compile(
+    r'\b(' + '|'.join(sorted(
+        {re.escape(keyword) for keywords, _ in FALLBACK_BUCKETS for keyword in keywords},
+        key=len, reverse=True
+    )) + r')(?:\.?js|\d+(?:\.\d+)*)?\b',
+    re.IGNORECASE
+)
+
+
+# Screening states in the order they're visited, for progress reporting
+STATES_ORDER = (
+    ConversationState.GREETING,
+    ConversationState.COLLECTING_NAME,
+    ConversationState.COLLECTING_EMAIL,
+    ConversationState.COLLECTING_PHONE,
+    ConversationState.COLLECTING_EXPERIENCE,
+    ConversationState.COLLECTING_POSITION,
+    ConversationState.COLLECTING_LOCATION,
+    ConversationState.COLLECTING_TECH_STACK,
+    ConversationState.TECHNICAL_QUESTIONS,
+    ConversationState.COMPLETED
+)
+STATE_INDEX = {state: index for index, state in enumerate(STATES_ORDER)}
+
+
+# A line starting a new question ("1.", "2)", "-" or "•"); group 1 is its text
+QUESTION_START_RE = re.compile(r'^(?:\d+[.)]|[-•])\s*(.*)$')
+
+
+def _iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Split streamed text chunks into complete lines.
+    
+    Args:
+        chunks: Text chunks as they arrive from the LLM
+        
+    Yields:
+        str: Each line, without its newline, as soon as it is complete
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split('\n')
+        yield from lines
+    if buffer:
+        yield buffer
 
 
 class HiringAssistant:
@@ -26,19 +237,39 @@ class HiringAssistant:
     Supports multiple LLM providers through abstraction layer.
     """
     
-    def __init__(self, provider: str = None):
+    # One instance lives in every Streamlit session; slots drop the per-instance dict
+    __slots__ = (
+        "llm_provider", "state", "candidate_info",
+        "tech_stack_display", "answer_previews",
+        "technical_questions", "question_messages", "current_question_index",
+        "conversation_history", "conversation_ended",
+        "session_id", "_completion_future",
+        "_candidate_info_version", "_candidate_info_text",
+        "_candidate_info_text_version", "_system_msg_cache", "_system_msg_cache_key"
+    )
+    
+    def __init__(self, provider: str = None, llm_provider: "BaseLLMProvider" = None):
         """
         Initialize the Hiring Assistant.
         
         Args:
             provider: LLM provider to use ('groq', 'openai', 'huggingface', or 'auto')
+            llm_provider: Optional pre-built provider instance to share between
+                         sessions (skips provider construction entirely)
         """
-        self.llm_provider: BaseLLMProvider = LLMProviderFactory.create(provider)
+        self.llm_provider: "BaseLLMProvider" = llm_provider or self._create_provider(provider)
         self.reset_conversation()
-        print(f"Using LLM Provider: {self.llm_provider.name}")
+        logger.info("Using LLM Provider: %s", self.llm_provider.name)
     
     def reset_conversation(self):
         """Reset the conversation state and candidate information."""
+        # Bumped whenever candidate info changes, so its serialized form and
+        # the system message are only rebuilt when something in them did
+        self._candidate_info_version = 0
+        self._candidate_info_text = None
+        self._candidate_info_text_version = -1
+        self._system_msg_cache = None
+        self._system_msg_cache_key = None
         self.state = ConversationState.GREETING
         self.candidate_info = {
             "name": None,
@@ -51,112 +282,254 @@ class HiringAssistant:
             "tech_stack_raw": None,
             "technical_answers": []
         }
+        # Display-only forms, computed once when the data is collected. Kept
+        # out of candidate_info so they are neither saved nor sent to the LLM.
+        self.tech_stack_display = None
+        self.answer_previews = []
         self.technical_questions = []
+        # Ready-made "next question" message for each question, built once
+        self.question_messages = ()
         self.current_question_index = 0
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=MAX_CONVERSATION_HISTORY)
+        self.conversation_ended = False
+        # Stable per-screening id sent with LLM calls for provider-side caching
+        self.session_id = uuid.uuid4().hex
+        # Closing message, requested while the candidate answers questions
+        self._completion_future: Optional[Future] = None
     
-    def switch_provider(self, provider: str):
+    def switch_provider(self, provider: str, llm_provider: "BaseLLMProvider" = None):
         """
         Switch to a different LLM provider.
         
         Args:
             provider: New provider name
+            llm_provider: Optional pre-built provider instance for that name
         """
-        self.llm_provider = LLMProviderFactory.create(provider)
-        print(f"Switched to LLM Provider: {self.llm_provider.name}")
+        self.llm_provider = llm_provider or self._create_provider(provider)
+        logger.info("Switched to LLM Provider: %s", self.llm_provider.name)
+    
+    @staticmethod
+    def _create_provider(provider: str = None) -> "BaseLLMProvider":
+        """
+        Build a provider, importing the provider layer only when needed.
+        
+        Callers that pass a shared provider instance (like the Streamlit app)
+        never pay for the import here.
+        
+        Args:
+            provider: Provider name ('groq', 'openai', 'huggingface', or 'auto')
+            
+        Returns:
+            BaseLLMProvider: The provider instance
+        """
+        from llm_providers import LLMProviderFactory
+        return LLMProviderFactory.create(provider)
     
     def get_provider_name(self) -> str:
         """Get the current LLM provider name."""
         return self.llm_provider.name
     
-    def _call_llm(self, prompt: str, system_context: str = None) -> str:
+    def _update_candidate_info(self, **fields):
+        """Record collected candidate fields."""
+        self.candidate_info.update(fields)
+        self._candidate_info_version += 1
+    
+    def _get_system_message(self, state: str = None) -> str:
         """
-        Make a call to the LLM API.
+        Build the system prompt for the given state (default: current state).
+        
+        The last message is reused until the state or candidate info changes.
+        """
+        state = state or self.state
+        cache_key = (state, self._candidate_info_version)
+        if self._system_msg_cache_key != cache_key:
+            self._system_msg_cache = SYSTEM_PROMPT_PREFIX + FMT_SYSTEM_PROMPT_DYNAMIC_SUFFIX(
+                state=state,
+                candidate_info=self._get_candidate_info_text()
+            )
+            self._system_msg_cache_key = cache_key
+        return self._system_msg_cache
+    
+    def _get_candidate_info_text(self) -> str:
+        """Masked candidate info as sent to the LLM, re-serialized only after changes."""
+        if self._candidate_info_text_version != self._candidate_info_version:
+            self._candidate_info_text = str(self._get_safe_candidate_info())
+            self._candidate_info_text_version = self._candidate_info_version
+        return self._candidate_info_text
+    
+    def _llm_reply(self, prompt: str, system_context: str = None,
+                   cache_key: tuple = None) -> LLMReply:
+        """
+        Prepare an LLM call for the current state without sending it yet.
         
         Args:
             prompt: The user prompt
             system_context: Optional system context override
+            cache_key: Key to share the response across sessions under; only
+                      for replies that contain no candidate-specific content
             
         Returns:
-            str: LLM response text
+            LLMReply: Deferred LLM call
         """
-        system_msg = system_context or SYSTEM_PROMPT.format(
-            state=self.state,
-            candidate_info=self._get_safe_candidate_info()
+        system_msg = system_context or self._get_system_message()
+        return LLMReply(prompt, system_msg, self.state, cache_key)
+    
+    def _response_cache_key(self, reply: LLMReply) -> Optional[str]:
+        """Scope a reply's cache key to the current provider, model and prompt."""
+        if reply.cache_key is None:
+            return None
+        return ResponseCache.make_key(
+            self.llm_provider.name,
+            getattr(self.llm_provider, "model", ""),
+            reply.prompt,
+            *reply.cache_key
         )
+    
+    def _resolve_reply(self, reply: Union[str, LLMReply, Iterator[str]]) -> str:
+        """
+        Turn a handler reply into response text, calling the LLM if needed.
+        
+        Args:
+            reply: Static response text, a deferred LLM call, or text chunks
+            
+        Returns:
+            str: Response text
+        """
+        if isinstance(reply, str):
+            return reply
+        if not isinstance(reply, LLMReply):
+            return "".join(reply)
+        
+        cache_key = self._response_cache_key(reply)
+        if cache_key:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         # Call the LLM provider
-        response = self.llm_provider.generate(prompt, system_msg)
+        response = self.llm_provider.generate(
+            reply.prompt, reply.system_msg, user=self.session_id
+        )
+        
+        # If LLM fails, use fallback
+        if response is None:
+            return self._get_fallback_response(reply.prompt, reply.state)
+        
+        if cache_key:
+            response_cache.put(cache_key, response)
+        return response
+    
+    async def _resolve_reply_async(self, reply: Union[str, LLMReply, Iterator[str]]) -> str:
+        """
+        Async variant of _resolve_reply.
+        
+        Args:
+            reply: Static response text, a deferred LLM call, or text chunks
+            
+        Returns:
+            str: Response text
+        """
+        if isinstance(reply, str):
+            return reply
+        if not isinstance(reply, LLMReply):
+            # Chunk generators make blocking calls, so drain them off the loop
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, "".join, reply)
+        
+        cache_key = self._response_cache_key(reply)
+        if cache_key:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        response = await self.llm_provider.generate_async(
+            reply.prompt, reply.system_msg, user=self.session_id
+        )
         
         # If LLM fails, use fallback
         if response is None:
-            return self._get_fallback_response(prompt)
+            return self._get_fallback_response(reply.prompt, reply.state)
         
+        if cache_key:
+            response_cache.put(cache_key, response)
         return response
     
-    def _get_fallback_response(self, context: str) -> str:
+    def _stream_reply(self, reply: Union[str, LLMReply, Iterator[str]]) -> Iterator[str]:
+        """
+        Stream a handler reply chunk by chunk.
+        
+        Args:
+            reply: Static response text, a deferred LLM call, or text chunks
+            
+        Yields:
+            str: Response text chunks
+        """
+        if isinstance(reply, str):
+            yield reply
+            return
+        if not isinstance(reply, LLMReply):
+            yield from reply
+            return
+        
+        cache_key = self._response_cache_key(reply)
+        if cache_key:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        chunks = []
+        stream = self.llm_provider.generate_stream(
+            reply.prompt, reply.system_msg, user=self.session_id
+        )
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        
+        # If LLM fails, use fallback
+        if not chunks:
+            yield self._get_fallback_response(reply.prompt, reply.state)
+        elif cache_key:
+            response_cache.put(cache_key, "".join(chunks))
+    
+    def _call_llm(self, prompt: str, system_context: str = None) -> str:
+        """
+        Make a call to the LLM API.
+        
+        Args:
+            prompt: The user prompt
+            system_context: Optional system context override
+            
+        Returns:
+            str: LLM response text
+        """
+        return self._resolve_reply(self._llm_reply(prompt, system_context))
+    
+    async def _call_llm_async(self, prompt: str, system_context: str = None) -> str:
+        """
+        Async variant of _call_llm.
+        
+        Args:
+            prompt: The user prompt
+            system_context: Optional system context override
+            
+        Returns:
+            str: LLM response text
+        """
+        return await self._resolve_reply_async(self._llm_reply(prompt, system_context))
+    
+    def _get_fallback_response(self, context: str, state: str = None) -> str:
         """
         Provide fallback responses when LLM is unavailable.
         
         Args:
             context: Context for generating appropriate fallback
+            state: State to respond for (defaults to the current state)
             
         Returns:
             str: Fallback response
         """
-        fallbacks = {
-            ConversationState.GREETING: (
-                "👋 Welcome to TalentScout! I'm your AI hiring assistant.\n\n"
-                "I'll help guide you through our initial screening process. "
-                "This will take about 5-10 minutes.\n\n"
-                "**Let's start! What is your full name?**"
-            ),
-            ConversationState.COLLECTING_NAME: (
-                f"Nice to meet you! 😊\n\n"
-                "Could you please provide your **email address**?"
-            ),
-            ConversationState.COLLECTING_EMAIL: (
-                "Great, thank you!\n\n"
-                "What's the best **phone number** to reach you?"
-            ),
-            ConversationState.COLLECTING_PHONE: (
-                "Perfect!\n\n"
-                "How many **years of experience** do you have in the tech industry?"
-            ),
-            ConversationState.COLLECTING_EXPERIENCE: (
-                "Excellent experience!\n\n"
-                "What **position(s)** are you interested in applying for?\n"
-                "(e.g., Software Engineer, Full Stack Developer, Data Scientist)"
-            ),
-            ConversationState.COLLECTING_POSITION: (
-                "Great choice!\n\n"
-                "What is your **current location**? (City, Country)"
-            ),
-            ConversationState.COLLECTING_LOCATION: (
-                "Thank you!\n\n"
-                "Now, please list your **tech stack** including:\n"
-                "• Programming languages\n"
-                "• Frameworks\n"
-                "• Databases\n"
-                "• Tools & technologies\n\n"
-                "Be as specific as possible - this helps us generate relevant questions!"
-            ),
-            ConversationState.TECHNICAL_QUESTIONS: (
-                "Thank you for your answer! Let me ask the next question."
-            ),
-            ConversationState.COMPLETED: (
-                "🎉 **Thank you for completing the screening!**\n\n"
-                "Your information has been recorded successfully. "
-                "Our recruitment team will review your profile and "
-                "contact you within **3-5 business days**.\n\n"
-                "We appreciate your interest in joining through TalentScout. "
-                "Good luck! 🍀"
-            )
-        }
-        return fallbacks.get(
-            self.state, 
-            "I apologize, but I'm having trouble processing that. Could you please try again?"
-        )
+        return FALLBACK_RESPONSES.get(state or self.state, DEFAULT_FALLBACK_RESPONSE)
     
     def _get_safe_candidate_info(self) -> Dict[str, Any]:
         """
@@ -165,55 +538,131 @@ class HiringAssistant:
         Returns:
             dict: Masked candidate information
         """
-        safe_info = self.candidate_info.copy()
-        if safe_info.get('email'):
-            safe_info['email'] = '[PROVIDED]'
-        if safe_info.get('phone'):
-            safe_info['phone'] = '[PROVIDED]'
-        return safe_info
+        info = self.candidate_info
+        return {
+            **info,
+            'email': '[PROVIDED]' if info['email'] else info['email'],
+            'phone': '[PROVIDED]' if info['phone'] else info['phone']
+        }
     
-    def _generate_technical_questions(self) -> List[str]:
+    def _iter_technical_questions(self) -> Iterator[str]:
         """
         Generate technical questions based on candidate's tech stack.
         
-        Returns:
-            list: List of technical questions
+        The LLM output is streamed and each question is yielded as soon as
+        it is complete, so the first one can be shown while the rest are
+        still being written.
+        
+        Yields:
+            str: Technical questions (may be fewer than requested)
         """
-        prompt = GENERATE_QUESTIONS_PROMPT.format(
+        # Questions only depend on the stack, position and experience, so
+        # candidates with the same profile share one generation
+        cache_key = ResponseCache.make_key(
+            self.llm_provider.name,
+            getattr(self.llm_provider, "model", ""),
+            GENERATE_QUESTIONS_PROMPT,
+            normalize_tech_stack(self.candidate_info['tech_stack_raw']),
+            (self.candidate_info['desired_position'] or '').lower(),
+            self.candidate_info['experience_years']
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            yield from cached
+            return
+        
+        # Near-identical stack/position wording; experience still has to match
+        semantic_namespace = (
+            self.llm_provider.name,
+            getattr(self.llm_provider, "model", ""),
+            self.candidate_info['experience_years']
+        )
+        profile_text = (
+            f"{self.candidate_info['tech_stack_raw']}; "
+            f"{self.candidate_info['desired_position'] or ''}"
+        )
+        if semantic_cache is not None:
+            cached = semantic_cache.get(semantic_namespace, profile_text)
+            if cached is not None:
+                response_cache.put(cache_key, cached)
+                yield from cached
+                return
+        
+        prompt = FMT_GENERATE_QUESTIONS(
             tech_stack=self.candidate_info['tech_stack_raw'],
-            num_questions=5,
+            num_questions=NUM_TECHNICAL_QUESTIONS,
             position=self.candidate_info['desired_position'],
             experience=self.candidate_info['experience_years']
         )
+        # The questions are shared with other candidates (and persisted), so
+        # the request carries only the static system prompt: no name,
+        # contact details or location that could shape the output
+        chunks = self.llm_provider.generate_stream(
+            prompt, SYSTEM_PROMPT_STATIC, user=self.session_id
+        )
         
-        response = self._call_llm(prompt)
-        
-        # Parse questions from response
         questions = []
-        lines = response.split('\n')
-        current_question = ""
-        
-        for line in lines:
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                if current_question:
-                    questions.append(current_question.strip())
-                # Clean the line prefix
-                current_question = line.lstrip('0123456789.-•) ').strip()
-            elif current_question and line:
-                current_question += " " + line
-        
-        if current_question:
-            questions.append(current_question.strip())
+        try:
+            for question in self._parse_questions(_iter_lines(chunks)):
+                questions.append(question)
+                yield question
+                if len(questions) == NUM_TECHNICAL_QUESTIONS:
+                    break
+        finally:
+            # Stop the provider's stream now rather than when this frame is freed
+            chunks.close()
+        
+        # Only share sets the LLM actually produced
+        if len(questions) >= 3:
+            response_cache.put(cache_key, questions)
+            if semantic_cache is not None:
+                semantic_cache.put(semantic_namespace, profile_text, questions)
+    
+    @staticmethod
+    def _parse_questions(lines: Iterable[str]) -> Iterator[str]:
+        """
+        Parse numbered or bulleted questions from LLM output lines.
         
-        # Filter out empty questions and limit
-        questions = [q for q in questions if len(q) > 10]
+        A question runs from its numbered/bulleted line until the next one,
+        so it is yielded once the following question starts (or the output
+        ends).
         
-        # Fallback questions if parsing failed
-        if len(questions) < 3:
-            questions = self._get_fallback_questions()
+        Args:
+            lines: Lines of the LLM response
+            
+        Yields:
+            str: Each question with its prefix removed
+        """
+        # Collect each question's lines as parts and join once instead of
+        # concatenating per line
+        current_parts = []
         
-        return questions[:5]  # Limit to 5 questions
+        for line in lines:
+            line = line.strip()
+            match = QUESTION_START_RE.match(line)
+            if match:
+                if current_parts:
+                    question = " ".join(current_parts).strip()
+                    # Skip empty/fragment questions
+                    if len(question) > 10:
+                        yield question
+                # Keep the text after the number/bullet
+                current_parts = [match.group(1)]
+            elif current_parts and current_parts[0] and line:
+                current_parts.append(line)
+        
+        if current_parts:
+            question = " ".join(current_parts).strip()
+            if len(question) > 10:
+                yield question
+    
+    def _top_up_technical_questions(self):
+        """Fill the question set up to NUM_TECHNICAL_QUESTIONS with fallbacks."""
+        for question in (*self._get_fallback_questions(), *GENERAL_FALLBACK_QUESTIONS):
+            if len(self.technical_questions) >= NUM_TECHNICAL_QUESTIONS:
+                break
+            if question not in self.technical_questions:
+                self.technical_questions.append(question)
     
     def _get_fallback_questions(self) -> List[str]:
         """
@@ -222,93 +671,37 @@ class HiringAssistant:
         Returns:
             list: Default technical questions
         """
-        tech = self.candidate_info.get('tech_stack_raw', '').lower()
-        questions = []
+        tech = self.candidate_info.get('tech_stack_raw', '')
+        found = {match.group(1).lower() for match in FALLBACK_PATTERN.finditer(tech)}
         
-        # Python questions
-        if 'python' in tech:
-            questions.extend([
-                "Explain the difference between a list and a tuple in Python. When would you use each?",
-                "What are Python decorators and can you give an example of when you'd use one?",
-                "How does Python's garbage collection work? What is reference counting?"
-            ])
-        
-        # JavaScript/Frontend questions
-        if any(t in tech for t in ['javascript', 'react', 'angular', 'vue', 'node']):
-            questions.extend([
-                "Explain the concept of closures in JavaScript with a practical example.",
-                "What is the event loop in JavaScript and how does it handle asynchronous operations?",
-                "Describe the difference between '==' and '===' in JavaScript."
-            ])
-        
-        # React specific
-        if 'react' in tech:
-            questions.extend([
-                "Explain the Virtual DOM in React and how it improves performance.",
-                "What are React Hooks? Explain useState and useEffect with examples.",
-                "How do you handle state management in large React applications?"
-            ])
-        
-        # Database questions
-        if any(t in tech for t in ['sql', 'mysql', 'postgresql', 'database', 'mongodb']):
-            questions.extend([
-                "Explain the difference between SQL and NoSQL databases. When would you choose one over the other?",
-                "What are database indexes and how do they improve query performance?",
-                "Describe ACID properties in databases and why they're important."
-            ])
-        
-        # DevOps/Cloud questions
-        if any(t in tech for t in ['docker', 'kubernetes', 'aws', 'azure', 'devops']):
-            questions.extend([
-                "Explain the difference between containers and virtual machines.",
-                "What is CI/CD and why is it important in modern software development?",
-                "Describe your experience with cloud services and infrastructure as code."
-            ])
-        
-        # Java questions
-        if 'java' in tech:
-            questions.extend([
-                "Explain the difference between an abstract class and an interface in Java.",
-                "What is the Java Virtual Machine (JVM) and how does it work?",
-                "Describe the concept of multithreading in Java and how you handle synchronization."
-            ])
-        
-        # Machine Learning questions
-        if any(t in tech for t in ['machine learning', 'ml', 'tensorflow', 'pytorch', 'data science']):
-            questions.extend([
-                "Explain the difference between supervised and unsupervised learning with examples.",
-                "What is overfitting and how do you prevent it?",
-                "Describe a machine learning project you've worked on and the challenges you faced."
-            ])
+        questions = []
+        for keywords, bucket in FALLBACK_BUCKETS:
+            if not found.isdisjoint(keywords):
+                questions.extend(bucket)
         
         # Generic fallback questions (if no specific tech matched)
         if len(questions) < 3:
-            questions.extend([
-                "Describe a challenging technical problem you solved recently. What was your approach?",
-                "How do you ensure code quality in your projects? What practices do you follow?",
-                "Explain your experience with version control systems and collaborative development.",
-                "How do you approach learning new technologies or frameworks?",
-                "Describe your debugging process when encountering a difficult bug."
-            ])
+            questions.extend(GENERAL_FALLBACK_QUESTIONS)
         
-        return questions[:5]
+        return questions[:NUM_TECHNICAL_QUESTIONS]
     
-    def process_input(self, user_input: str) -> Tuple[str, bool]:
+    def _begin_turn(self, user_input: str) -> Optional[str]:
         """
-        Process user input and return appropriate response.
+        Sanitize user input and record it in the conversation history.
         
         Args:
             user_input: The user's input text
             
         Returns:
-            tuple: (response_text, is_conversation_ended)
+            str or None: Sanitized input, or None if the user asked to exit
         """
         # Sanitize input
         user_input = sanitize_input(user_input)
         
         # Check for exit commands
         if is_exit_command(user_input):
-            return self._handle_exit(), True
+            self.conversation_ended = True
+            return None
         
         # Add to conversation history
         self.conversation_history.append({
@@ -317,67 +710,120 @@ class HiringAssistant:
             "state": self.state
         })
         
-        # Process based on current state
-        response = self._process_state(user_input)
+        return user_input
+    
+    def _end_turn(self, response: str) -> bool:
+        """
+        Record the response in the conversation history.
         
-        # Add response to history
+        Args:
+            response: The full response text
+            
+        Returns:
+            bool: True if the conversation has ended
+        """
         self.conversation_history.append({
             "role": "assistant",
             "content": response,
             "state": self.state
         })
         
-        is_ended = self.state == ConversationState.COMPLETED
-        
-        return response, is_ended
+        self.conversation_ended = self.state == ConversationState.COMPLETED
+        return self.conversation_ended
     
-    def _process_state(self, user_input: str) -> str:
+    def process_input(self, user_input: str) -> Tuple[str, bool]:
         """
-        Process input based on current conversation state.
+        Process user input and return appropriate response.
         
         Args:
-            user_input: The user's input
+            user_input: The user's input text
             
         Returns:
-            str: Response text
+            tuple: (response_text, is_conversation_ended)
         """
-        if self.state == ConversationState.GREETING:
-            return self._handle_greeting()
+        user_input = self._begin_turn(user_input)
+        if user_input is None:
+            return self._handle_exit(), True
         
-        elif self.state == ConversationState.COLLECTING_NAME:
-            return self._handle_name(user_input)
+        # Process based on current state
+        response = self._resolve_reply(self._process_state(user_input))
         
-        elif self.state == ConversationState.COLLECTING_EMAIL:
-            return self._handle_email(user_input)
+        return response, self._end_turn(response)
+    
+    def stream_input(self, user_input: str) -> Iterator[str]:
+        """
+        Process user input and stream the response as it is generated.
         
-        elif self.state == ConversationState.COLLECTING_PHONE:
-            return self._handle_phone(user_input)
+        Same flow as process_input; check `conversation_ended` once the
+        stream is exhausted.
         
-        elif self.state == ConversationState.COLLECTING_EXPERIENCE:
-            return self._handle_experience(user_input)
+        Args:
+            user_input: The user's input text
+            
+        Yields:
+            str: Response text chunks
+        """
+        user_input = self._begin_turn(user_input)
+        if user_input is None:
+            yield self._handle_exit()
+            return
+        
+        # Process based on current state, streaming LLM output as it arrives
+        chunks = []
+        for chunk in self._stream_reply(self._process_state(user_input)):
+            chunks.append(chunk)
+            yield chunk
+        
+        self._end_turn("".join(chunks))
+    
+    async def process_input_async(self, user_input: str) -> Tuple[str, bool]:
+        """
+        Async variant of process_input.
         
-        elif self.state == ConversationState.COLLECTING_POSITION:
-            return self._handle_position(user_input)
+        The state step (validation, question generation, saving) runs in a
+        worker thread and the reply is awaited on the provider's async
+        client, so the event loop stays free to serve other screenings.
         
-        elif self.state == ConversationState.COLLECTING_LOCATION:
-            return self._handle_location(user_input)
+        Args:
+            user_input: The user's input text
+            
+        Returns:
+            tuple: (response_text, is_conversation_ended)
+        """
+        user_input = self._begin_turn(user_input)
+        if user_input is None:
+            return self._handle_exit(), True
         
-        elif self.state == ConversationState.COLLECTING_TECH_STACK:
-            return self._handle_tech_stack(user_input)
+        loop = asyncio.get_running_loop()
+        reply = await loop.run_in_executor(None, self._process_state, user_input)
+        response = await self._resolve_reply_async(reply)
         
-        elif self.state == ConversationState.TECHNICAL_QUESTIONS:
-            return self._handle_technical_answer(user_input)
+        return response, self._end_turn(response)
+    
+    def _process_state(self, user_input: str) -> Union[str, LLMReply, Iterator[str]]:
+        """
+        Process input based on current conversation state.
         
-        else:
+        Args:
+            user_input: The user's input
+            
+        Returns:
+            str, LLMReply or iterator: Response text, an LLM call to make for
+            it, or response chunks produced as the reply is generated
+        """
+        handler = self._STATE_HANDLERS.get(self.state)
+        if handler is None:
             return self._get_fallback_response("")
+        return handler(self, user_input)
     
-    def _handle_greeting(self) -> str:
+    def _handle_greeting(self) -> LLMReply:
         """Handle the greeting state."""
-        response = self._call_llm(GREETING_PROMPT)
+        # The greeting is the same for every candidate
+        reply = self._llm_reply(GREETING_PROMPT, cache_key=("greeting",))
         self.state = ConversationState.COLLECTING_NAME
-        return response
+        return reply
     
-    def _handle_name(self, user_input: str) -> str:
+    def _handle_name(self, user_input: str) -> Union[str, LLMReply]:
         """Handle name collection."""
         # Basic validation - name should have at least 2 characters
         name = user_input.strip()
@@ -385,13 +831,13 @@ class HiringAssistant:
             return "I didn't quite catch that. Could you please tell me your **full name**?"
         
         # Clean up the name (capitalize properly)
-        self.candidate_info['name'] = name.title()
+        self._update_candidate_info(name=name.title())
         self.state = ConversationState.COLLECTING_EMAIL
         
-        prompt = COLLECT_EMAIL_PROMPT.format(name=self.candidate_info['name'])
-        return self._call_llm(prompt)
+        prompt = FMT_COLLECT_EMAIL(name=self.candidate_info['name'])
+        return self._llm_reply(prompt)
     
-    def _handle_email(self, user_input: str) -> str:
+    def _handle_email(self, user_input: str) -> Union[str, LLMReply]:
         """Handle email collection."""
         email = user_input.strip().lower()
         
@@ -401,13 +847,13 @@ class HiringAssistant:
                 "Please provide a valid email in the format: **example@domain.com**"
             )
         
-        self.candidate_info['email'] = email
+        self._update_candidate_info(email=email)
         self.state = ConversationState.COLLECTING_PHONE
         
-        prompt = COLLECT_PHONE_PROMPT.format(email="[provided]")
-        return self._call_llm(prompt)
+        prompt = FMT_COLLECT_PHONE(email="[provided]")
+        return self._llm_reply(prompt)
     
-    def _handle_phone(self, user_input: str) -> str:
+    def _handle_phone(self, user_input: str) -> Union[str, LLMReply]:
         """Handle phone number collection."""
         phone = user_input.strip()
         
@@ -418,12 +864,12 @@ class HiringAssistant:
                 "Example: +1-555-123-4567 or 5551234567"
             )
         
-        self.candidate_info['phone'] = phone
+        self._update_candidate_info(phone=phone)
         self.state = ConversationState.COLLECTING_EXPERIENCE
         
-        return self._call_llm(COLLECT_EXPERIENCE_PROMPT)
+        return self._llm_reply(COLLECT_EXPERIENCE_PROMPT)
     
-    def _handle_experience(self, user_input: str) -> str:
+    def _handle_experience(self, user_input: str) -> Union[str, LLMReply]:
         """Handle experience collection."""
         years = validate_experience(user_input)
         
@@ -434,13 +880,13 @@ class HiringAssistant:
                 "Examples: '5 years', '3', 'about 2 years'"
             )
         
-        self.candidate_info['experience_years'] = years
+        self._update_candidate_info(experience_years=years)
         self.state = ConversationState.COLLECTING_POSITION
         
-        prompt = COLLECT_POSITION_PROMPT.format(years=years)
-        return self._call_llm(prompt)
+        prompt = FMT_COLLECT_POSITION(years=years)
+        return self._llm_reply(prompt)
     
-    def _handle_position(self, user_input: str) -> str:
+    def _handle_position(self, user_input: str) -> Union[str, LLMReply]:
         """Handle desired position collection."""
         position = user_input.strip()
         
@@ -454,13 +900,13 @@ class HiringAssistant:
                 "• DevOps Engineer"
             )
         
-        self.candidate_info['desired_position'] = position
+        self._update_candidate_info(desired_position=position)
         self.state = ConversationState.COLLECTING_LOCATION
         
-        prompt = COLLECT_LOCATION_PROMPT.format(position=self.candidate_info['desired_position'])
-        return self._call_llm(prompt)
+        prompt = FMT_COLLECT_LOCATION(position=self.candidate_info['desired_position'])
+        return self._llm_reply(prompt)
     
-    def _handle_location(self, user_input: str) -> str:
+    def _handle_location(self, user_input: str) -> Union[str, LLMReply]:
         """Handle location collection."""
         location = user_input.strip()
         
@@ -470,12 +916,12 @@ class HiringAssistant:
                 "Examples: 'New York, USA', 'London, UK', 'Bangalore, India'"
             )
         
-        self.candidate_info['location'] = location
+        self._update_candidate_info(location=location)
         self.state = ConversationState.COLLECTING_TECH_STACK
         
-        return self._call_llm(COLLECT_TECH_STACK_PROMPT)
+        return self._llm_reply(COLLECT_TECH_STACK_PROMPT)
     
-    def _handle_tech_stack(self, user_input: str) -> str:
+    def _handle_tech_stack(self, user_input: str) -> Union[str, Iterator[str]]:
         """Handle tech stack collection."""
         tech_stack = user_input.strip()
         
@@ -489,60 +935,120 @@ class HiringAssistant:
                 "• **Tools** (Docker, Git, AWS, etc.)"
             )
         
-        self.candidate_info['tech_stack_raw'] = tech_stack
-        self.candidate_info['tech_stack'] = extract_tech_stack(tech_stack)
+        self._update_candidate_info(
+            tech_stack_raw=tech_stack,
+            tech_stack=extract_tech_stack(tech_stack)
+        )
+        self.tech_stack_display = truncate_for_display(tech_stack, 50)
         
-        # Generate technical questions
-        self.technical_questions = self._generate_technical_questions()
+        # Technical questions are generated while the reply streams
+        self.technical_questions = []
         self.current_question_index = 0
         self.state = ConversationState.TECHNICAL_QUESTIONS
         
-        # Present first question
-        intro = (
-            f"Excellent! 🎯 Based on your tech stack, I have **{len(self.technical_questions)} "
+        # The closing message doesn't depend on the answers, so fetch it now
+        # and have it ready when the last question is answered
+        completion_reply = LLMReply(
+            COMPLETION_PROMPT,
+            self._get_system_message(ConversationState.COMPLETED),
+            ConversationState.COMPLETED
+        )
+        self._completion_future = _prefetch_executor.submit(
+            self._resolve_reply, completion_reply
+        )
+        
+        return self._present_technical_questions()
+    
+    def _present_technical_questions(self) -> Iterator[str]:
+        """
+        Generate the technical questions, presenting the first one as soon as
+        it is ready while the rest are still being generated.
+        
+        Yields:
+            str: The intro with the first question
+        """
+        presented = False
+        try:
+            for question in self._iter_technical_questions():
+                self.technical_questions.append(question)
+                if not presented:
+                    presented = True
+                    yield self._technical_questions_intro()
+        finally:
+            # Runs even if the stream is abandoned, so the set is always full
+            self._top_up_technical_questions()
+            self._build_question_messages()
+        
+        if not presented:
+            yield self._technical_questions_intro()
+    
+    def _build_question_messages(self):
+        """Format the message for every question once the set is final."""
+        total = len(self.technical_questions)
+        self.question_messages = tuple(
+            f"✅ Thank you for your answer!\n\n"
+            f"**Question {number}/{total}:**\n{question}"
+            for number, question in enumerate(self.technical_questions, start=1)
+        )
+    
+    def _technical_questions_intro(self) -> str:
+        """Build the message presenting the first technical question."""
+        return (
+            f"Excellent! 🎯 Based on your tech stack, I have **{NUM_TECHNICAL_QUESTIONS} "
             f"technical questions** for you.\n\n"
             f"Take your time with each answer. Here's the first one:\n\n"
-            f"**Question 1/{len(self.technical_questions)}:**\n{self.technical_questions[0]}"
+            f"**Question 1/{NUM_TECHNICAL_QUESTIONS}:**\n{self.technical_questions[0]}"
         )
-        
-        return intro
     
-    def _handle_technical_answer(self, user_input: str) -> str:
+    def _handle_technical_answer(self, user_input: str) -> Union[str, LLMReply]:
         """Handle technical question answers."""
         # Store the answer
         self.candidate_info['technical_answers'].append({
             "question": self.technical_questions[self.current_question_index],
             "answer": user_input.strip()
         })
+        self._candidate_info_version += 1
+        self.answer_previews.append(truncate_for_display(user_input.strip(), 200))
         
         self.current_question_index += 1
         
         # Check if there are more questions
-        if self.current_question_index < len(self.technical_questions):
-            q_num = self.current_question_index + 1
-            total = len(self.technical_questions)
-            
-            response = (
-                f"✅ Thank you for your answer!\n\n"
-                f"**Question {q_num}/{total}:**\n"
-                f"{self.technical_questions[self.current_question_index]}"
-            )
-            return response
+        if self.current_question_index < len(self.question_messages):
+            return self.question_messages[self.current_question_index]
         else:
             # All questions answered - complete the screening
             return self._complete_screening()
     
-    def _complete_screening(self) -> str:
+    def _complete_screening(self) -> Union[str, LLMReply]:
         """Complete the screening process."""
         self.state = ConversationState.COMPLETED
         
         # Save candidate data
         save_candidate_data(self.candidate_info)
         
-        # Generate completion message
-        response = self._call_llm(COMPLETION_PROMPT)
+        # Use the prefetched completion message if it arrives in time
+        future, self._completion_future = self._completion_future, None
+        if future is not None:
+            try:
+                return future.result(timeout=COMPLETION_PREFETCH_TIMEOUT)
+            except FutureTimeoutError:
+                pass
         
-        return response
+        # Generate completion message
+        return self._llm_reply(COMPLETION_PROMPT)
+    
+    # State handlers, looked up once per turn by _process_state
+    _STATE_HANDLERS = {
+        ConversationState.GREETING: lambda self, _: self._handle_greeting(),
+        ConversationState.COLLECTING_NAME: _handle_name,
+        ConversationState.COLLECTING_EMAIL: _handle_email,
+        ConversationState.COLLECTING_PHONE: _handle_phone,
+        ConversationState.COLLECTING_EXPERIENCE: _handle_experience,
+        ConversationState.COLLECTING_POSITION: _handle_position,
+        ConversationState.COLLECTING_LOCATION: _handle_location,
+        ConversationState.COLLECTING_TECH_STACK: _handle_tech_stack,
+        ConversationState.TECHNICAL_QUESTIONS: _handle_technical_answer,
+    }
     
     def _handle_exit(self) -> str:
         """Handle conversation exit."""
@@ -564,7 +1070,7 @@ class HiringAssistant:
     
     def get_greeting(self) -> str:
         """Get the initial greeting message."""
-        return self._handle_greeting()
+        return self._resolve_reply(self._handle_greeting())
     
     def get_progress(self) -> Dict[str, Any]:
         """
@@ -573,21 +1079,8 @@ class HiringAssistant:
         Returns:
             dict: Progress information
         """
-        states_order = [
-            ConversationState.GREETING,
-            ConversationState.COLLECTING_NAME,
-            ConversationState.COLLECTING_EMAIL,
-            ConversationState.COLLECTING_PHONE,
-            ConversationState.COLLECTING_EXPERIENCE,
-            ConversationState.COLLECTING_POSITION,
-            ConversationState.COLLECTING_LOCATION,
-            ConversationState.COLLECTING_TECH_STACK,
-            ConversationState.TECHNICAL_QUESTIONS,
-            ConversationState.COMPLETED
-        ]
-        
-        current_index = states_order.index(self.state) if self.state in states_order else 0
-        total_steps = len(states_order)
+        current_index = STATE_INDEX.get(self.state, 0)
+        total_steps = len(STATES_ORDER)
         
         return {
             "current_step": current_index + 1,
@@ -4,6 +4,7 @@ Supports multiple LLM providers: OpenAI, Groq, HuggingFace
 """
 
 import os
+import re
 from dotenv import load_dotenv
 from enum import Enum
 
@@ -33,6 +34,19 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 HUGGINGFACE_API_KEY = os.getenv("HUGGINGFACE_API_KEY", "")
 
+API_KEYS = {
+    LLMProvider.GROQ.value: GROQ_API_KEY,
+    LLMProvider.OPENAI.value: OPENAI_API_KEY,
+    LLMProvider.HUGGINGFACE.value: HUGGINGFACE_API_KEY,
+}
+
+# Auto-detection order: Groq (free & fast) > OpenAI > HuggingFace
+PROVIDER_PRIORITY = (
+    LLMProvider.GROQ.value,
+    LLMProvider.OPENAI.value,
+    LLMProvider.HUGGINGFACE.value,
+)
+
 # Default provider (will auto-detect based on available keys if not set)
 DEFAULT_PROVIDER = os.getenv("LLM_PROVIDER", "auto")
 
@@ -48,6 +62,9 @@ OPENAI_MODEL = "gpt-3.5-turbo"
 #                   mixtral-8x7b-32768, gemma2-9b-it
 GROQ_MODEL = "llama-3.3-70b-versatile"
 
+# Groq service tier ("on_demand", "flex" or "auto")
+GROQ_SERVICE_TIER = os.getenv("GROQ_SERVICE_TIER", "on_demand")
+
 # HuggingFace Models (Inference API)
 # Popular free models: mistralai/Mistral-7B-Instruct-v0.2, 
 #                      microsoft/DialoGPT-large, google/flan-t5-xxl
@@ -61,6 +78,51 @@ MAX_TOKENS = 1000
 TEMPERATURE = 0.7
 TOP_P = 0.9
 
+# Connection pool shared by the Groq and OpenAI clients
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY = 60  # seconds
+
+# HuggingFace Inference API session
+HF_TIMEOUT = (5, 60)  # (connect, read) seconds
+HF_MAX_RETRIES = 3  # retries on HF_RETRY_STATUSES and failed connects (never read timeouts)
+HF_RETRY_STATUSES = (429, 502, 503, 504)  # rate limited, gateway errors, model loading
+HF_RETRY_BACKOFF = 0.5  # seconds before the first retry, doubled (with jitter) after each
+HF_CIRCUIT_FAILURE_THRESHOLD = 3  # consecutive failed calls before the API is skipped
+HF_CIRCUIT_COOLDOWN = 30  # seconds to skip the API for once that happens
+HF_POOL_CONNECTIONS = 8
+HF_POOL_MAXSIZE = 16
+# Open the pooled connection (TCP + TLS) in the background once HuggingFace
+# is selected, so the first generate doesn't pay for the handshake
+HF_PREWARM = os.getenv("HF_PREWARM", "true").lower() == "true"
+
+# =============================================================================
+# Response Caching
+# =============================================================================
+
+# Max number of non-personalized LLM responses (greeting, generated question
+# sets) shared across sessions
+RESPONSE_CACHE_SIZE = 128
+
+# File the response cache is persisted to across restarts (empty to keep it
+# in memory only)
+RESPONSE_CACHE_FILE = os.getenv("RESPONSE_CACHE_FILE", "data/response_cache.jsonl")
+
+# Exact-match cache of every provider call, keyed on model, prompts and
+# sampling parameters. Only safe when sampling is deterministic, so it's on
+# by default only when TEMPERATURE is 0. Kept in memory only, since cached
+# prompts include candidate details.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", str(TEMPERATURE == 0)).lower() == "true"
+LLM_CACHE_SIZE = 1024
+LLM_CACHE_TTL = 3600  # seconds
+
+# Similarity cache for generated question sets, so near-identical profiles
+# ("Python, Django" vs "Django and Python") share one generation. Needs
+# sentence-transformers; off by default. Experience must match exactly.
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL", "all-MiniLM-L6-v2")
+SEMANTIC_CACHE_THRESHOLD = 0.93  # minimum cosine similarity for a hit
+SEMANTIC_CACHE_SIZE = 10000
+
 # =============================================================================
 # Application Settings
 # =============================================================================
@@ -68,6 +130,18 @@ TOP_P = 0.9
 APP_TITLE = "TalentScout Hiring Assistant"
 APP_ICON = "🎯"
 
+# Technical questions asked per screening
+NUM_TECHNICAL_QUESTIONS = 5
+
+# Max chat messages kept per session (a full screening is ~25 messages)
+MAX_CHAT_MESSAGES = 200
+
+# Max turns kept in the assistant's conversation history (oldest dropped first)
+MAX_CONVERSATION_HISTORY = 64
+
+# Seconds to wait for the prefetched closing message before requesting it again
+COMPLETION_PREFETCH_TIMEOUT = 5
+
 # =============================================================================
 # Conversation States
 # =============================================================================
@@ -93,6 +167,21 @@ EXIT_KEYWORDS = [
     "cancel", "terminate", "close", "done"
 ]
 
+EXIT_KEYWORDS_SET = frozenset(EXIT_KEYWORDS)
+
+# Matches an exit keyword as a whole word, so "backend" or "closure"
+# don't end the conversation
+EXIT_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, EXIT_KEYWORDS)) + r')\b',
+    re.IGNORECASE
+)
+
+# =============================================================================
+# Logging
+# =============================================================================
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # =============================================================================
 # Tech Stack Categories
 # =============================================================================
@@ -141,12 +230,4 @@ def get_available_provider() -> str:
     if DEFAULT_PROVIDER != "auto":
         return DEFAULT_PROVIDER
     
-    # Priority: Groq (free & fast) > OpenAI > HuggingFace
-    if GROQ_API_KEY:
-        return LLMProvider.GROQ.value
-    elif OPENAI_API_KEY:
-        return LLMProvider.OPENAI.value
-    elif HUGGINGFACE_API_KEY:
-        return LLMProvider.HUGGINGFACE.value
-    else:
-        return "none"
\ No newline at end of file
+    return next((name for name in PROVIDER_PRIORITY if API_KEYS[name]), "none")
@@ -3,37 +3,217 @@ LLM Provider abstraction layer for TalentScout Hiring Assistant.
 Supports: Groq, OpenAI, and HuggingFace Inference API.
 """
 
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import random
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict
-import requests
+from functools import lru_cache
+from typing import Optional, List, Dict, Iterator
 
 from config import (
     LLMProvider,
     OPENAI_API_KEY, OPENAI_MODEL,
-    GROQ_API_KEY, GROQ_MODEL,
+    GROQ_API_KEY, GROQ_MODEL, GROQ_SERVICE_TIER,
     HUGGINGFACE_API_KEY, HUGGINGFACE_MODEL,
+    HF_TIMEOUT, HF_MAX_RETRIES, HF_POOL_CONNECTIONS, HF_POOL_MAXSIZE, HF_PREWARM,
+    HF_RETRY_STATUSES, HF_RETRY_BACKOFF, HF_CIRCUIT_FAILURE_THRESHOLD, HF_CIRCUIT_COOLDOWN,
     MAX_TOKENS, TEMPERATURE, TOP_P,
-    get_available_provider
+    HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY,
+    PROVIDER_PRIORITY, get_available_provider,
+    LLM_CACHE_ENABLED, LLM_CACHE_SIZE, LLM_CACHE_TTL
 )
+from response_cache import ResponseCache
+
+
+logger = logging.getLogger("talentscout.llm")
+
+_shared_http_client = None
+_shared_http_client_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    """Check whether httpx can speak HTTP/2 (needs the optional `h2` package)."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _LoopLocalClients:
+    """
+    Async clients keyed by event loop, each closed when its loop shuts down.
+    
+    An async client's connections belong to the loop that opened them, so a
+    provider shared across loops (e.g. one asyncio.run per turn) needs one
+    client per loop. Each client is closed by a background task that
+    asyncio.run cancels at shutdown, while the loop can still run the close.
+    """
+    
+    def __init__(self, factory):
+        """
+        Args:
+            factory: Callable creating a new async client
+        """
+        self._factory = factory
+        self._clients = {}
+        self._closers = {}
+        self._lock = threading.Lock()
+    
+    def get(self):
+        """Get the client for the running loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                # Forget loops that were closed without shutting tasks down
+                for stale in [other for other in self._clients if other.is_closed()]:
+                    del self._clients[stale]
+                    self._closers.pop(stale, None)
+                client = self._factory()
+                self._clients[loop] = client
+                # Keep a reference; the loop itself only holds tasks weakly
+                self._closers[loop] = loop.create_task(self._close_at_shutdown(loop, client))
+            return client
+    
+    async def _close_at_shutdown(self, loop, client):
+        """Wait until cancelled (loop shutdown), then close the client."""
+        try:
+            await loop.create_future()
+        finally:
+            with self._lock:
+                if self._clients.get(loop) is client:
+                    del self._clients[loop]
+                    self._closers.pop(loop, None)
+            close = getattr(client, "aclose", None) or client.close
+            await close()
+
+
+@lru_cache(maxsize=None)
+def _sdk_installed(module: str) -> bool:
+    """
+    Check whether an SDK package is installed, without importing it.
+    
+    The SDKs themselves (and the httpx/pydantic/anyio stack they pull in)
+    are only imported when a provider makes its first request. The answer
+    is cached, since find_spec searches sys.path on every call.
+    """
+    return importlib.util.find_spec(module) is not None
+
+
+def get_shared_http_client():
+    """
+    Get the process-wide HTTP client for the sync SDK clients.
+    
+    Created on first use. Every Groq/OpenAI provider instance reuses its
+    keep-alive connections (over HTTP/2 when `h2` is installed), so new
+    instances don't pay for a fresh TCP + TLS handshake.
+    
+    Returns:
+        httpx.Client: The shared client
+    """
+    global _shared_http_client
+    with _shared_http_client_lock:
+        if _shared_http_client is None:
+            import httpx
+            _shared_http_client = httpx.Client(
+                http2=_http2_available(),
+                limits=httpx.Limits(
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                )
+            )
+        return _shared_http_client
 
 
 class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers."""
     
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: str = None) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for a chat-completions request.
+        
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt, sent first
+            
+        Returns:
+            list: The system message (if any) followed by the user message
+        """
+        user_message = {"role": "user", "content": prompt}
+        if system_prompt:
+            return [{"role": "system", "content": system_prompt}, user_message]
+        return [user_message]
+    
     @abstractmethod
-    def generate(self, prompt: str, system_prompt: str = None) -> str:
+    def generate(self, prompt: str, system_prompt: str = None,
+                 user: str = None) -> str:
         """
         Generate a response from the LLM.
         
         Args:
             prompt: The user prompt
             system_prompt: Optional system prompt for context
+            user: Optional stable id for the conversation, sent so the
+                  provider can route its turns to the same cached prefix
             
         Returns:
             str: The generated response
         """
         pass
     
+    async def generate_async(self, prompt: str, system_prompt: str = None,
+                             user: str = None) -> Optional[str]:
+        """
+        Generate a response from the LLM without blocking the event loop.
+        
+        Providers without an async client run generate() in a worker thread.
+        
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt for context
+            user: Optional stable id for the conversation
+            
+        Returns:
+            str: The generated response (None if the call failed)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate, prompt, system_prompt, user)
+    
+    def generate_stream(self, prompt: str, system_prompt: str = None,
+                        user: str = None) -> Iterator[str]:
+        """
+        Generate a response from the LLM, yielding text chunks as they arrive.
+        
+        Providers without native streaming yield the full response at once.
+        Nothing is yielded if the call fails.
+        
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt for context
+            user: Optional stable id for the conversation
+            
+        Yields:
+            str: Chunks of the generated response
+        """
+        response = self.generate(prompt, system_prompt, user)
+        if response:
+            yield response
+    
+    def prewarm(self):
+        """
+        Prepare for the first request once this provider has been selected.
+        
+        Does nothing by default; providers that can open connections ahead
+        of time override it.
+        """
+    
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the provider is available (has valid API key)."""
@@ -64,55 +244,149 @@ class GroqProvider(BaseLLMProvider):
         """
         self.api_key = api_key or GROQ_API_KEY
         self.model = model or GROQ_MODEL
+        # SDK clients are built on first use, so checking availability
+        # never imports groq or opens connections
         self.client = None
+        self._async_clients = _LoopLocalClients(self._create_async_client)
+        self._client_lock = threading.Lock()
         
-        if self.api_key:
-            try:
-                from groq import Groq
-                self.client = Groq(api_key=self.api_key)
-            except ImportError:
-                print("Groq library not installed. Run: pip install groq")
-            except Exception as e:
-                print(f"Error initializing Groq client: {e}")
+        if self.api_key and not _sdk_installed("groq"):
+            logger.warning("Groq library not installed. Run: pip install groq")
+    
+    def _get_client(self):
+        """Get the sync Groq client, creating it on first use."""
+        if self.client is None and self.is_available():
+            with self._client_lock:
+                if self.client is None:
+                    try:
+                        from groq import Groq
+                        self.client = Groq(api_key=self.api_key, http_client=get_shared_http_client())
+                    except Exception as e:
+                        logger.error("Error initializing Groq client: %s", e, exc_info=True)
+        return self.client
     
-    def generate(self, prompt: str, system_prompt: str = None) -> str:
+    def _get_async_client(self):
+        """Get the async Groq client for the running event loop, creating it on first use."""
+        if not self.is_available():
+            return None
+        try:
+            return self._async_clients.get()
+        except Exception as e:
+            logger.error("Error initializing Groq client: %s", e, exc_info=True)
+            return None
+    
+    def _create_async_client(self):
+        """Create an async Groq client (bound to the loop it's first used on)."""
+        from groq import AsyncGroq
+        return AsyncGroq(api_key=self.api_key, **self._async_http_client_kwargs())
+    
+    @staticmethod
+    def _async_http_client_kwargs() -> Dict:
+        """
+        Use the aiohttp transport for the async client when it's installed.
+        
+        aiohttp has lower per-request overhead than the default httpx
+        transport under many concurrent calls; it needs `pip install groq[aiohttp]`.
+        """
+        try:
+            from groq import DefaultAioHttpClient
+            import aiohttp  # noqa: F401
+        except ImportError:
+            return {}
+        return {"http_client": DefaultAioHttpClient()}
+    
+    @staticmethod
+    def _request_options(user: str = None) -> Dict:
+        """Per-request options: the service tier and, if known, the conversation id."""
+        options = {"service_tier": GROQ_SERVICE_TIER}
+        if user:
+            options["user"] = user
+        return options
+    
+    def generate(self, prompt: str, system_prompt: str = None,
+                 user: str = None) -> str:
         """Generate response using Groq API."""
-        if not self.client:
+        client = self._get_client()
+        if not client:
             return None
         
         try:
-            messages = []
+            messages = self._build_messages(prompt, system_prompt)
             
-            if system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
+            # Create completion (non-streaming for simplicity)
+            completion = client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=TEMPERATURE,
+                max_tokens=MAX_TOKENS,
+                top_p=TOP_P,
+                stream=False,
+                **self._request_options(user)
+            )
             
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
+            return completion.choices[0].message.content.strip()
+        
+        except Exception as e:
+            logger.error("Groq API Error: %s", e, exc_info=True)
+            return None
+    
+    async def generate_async(self, prompt: str, system_prompt: str = None,
+                             user: str = None) -> Optional[str]:
+        """Generate response using Groq's async client."""
+        async_client = self._get_async_client()
+        if not async_client:
+            return None
+        
+        try:
+            messages = self._build_messages(prompt, system_prompt)
             
-            # Create completion (non-streaming for simplicity)
-            completion = self.client.chat.completions.create(
+            completion = await async_client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=TEMPERATURE,
                 max_tokens=MAX_TOKENS,
                 top_p=TOP_P,
-                stream=False
+                stream=False,
+                **self._request_options(user)
             )
             
             return completion.choices[0].message.content.strip()
         
         except Exception as e:
-            print(f"Groq API Error: {e}")
+            logger.error("Groq API Error: %s", e, exc_info=True)
             return None
     
+    def generate_stream(self, prompt: str, system_prompt: str = None,
+                        user: str = None) -> Iterator[str]:
+        """Stream response chunks from Groq API."""
+        client = self._get_client()
+        if not client:
+            return
+        
+        try:
+            messages = self._build_messages(prompt, system_prompt)
+            
+            # Closing the stream releases its pooled connection even when the
+            # caller stops reading early
+            with client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=TEMPERATURE,
+                max_tokens=MAX_TOKENS,
+                top_p=TOP_P,
+                stream=True,
+                **self._request_options(user)
+            ) as stream:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        
+        except Exception as e:
+            logger.error("Groq API Error: %s", e, exc_info=True)
+    
     def is_available(self) -> bool:
-        """Check if Groq is available."""
-        return self.client is not None
+        """Check if Groq is configured (an API key is set and the SDK is installed)."""
+        return bool(self.api_key) and _sdk_installed("groq")
     
     @property
     def name(self) -> str:
@@ -136,52 +410,134 @@ class OpenAIProvider(BaseLLMProvider):
         """
         self.api_key = api_key or OPENAI_API_KEY
         self.model = model or OPENAI_MODEL
+        # SDK clients are built on first use, so checking availability
+        # never imports openai or opens connections
         self.client = None
+        self._async_clients = _LoopLocalClients(self._create_async_client)
+        self._client_lock = threading.Lock()
+        
+        if self.api_key and not _sdk_installed("openai"):
+            logger.warning("OpenAI library not installed. Run: pip install openai")
+    
+    def _get_client(self):
+        """Get the sync OpenAI client, creating it on first use."""
+        if self.client is None and self.is_available():
+            with self._client_lock:
+                if self.client is None:
+                    try:
+                        import openai
+                        self.client = openai.OpenAI(
+                            api_key=self.api_key,
+                            http_client=get_shared_http_client()
+                        )
+                    except Exception as e:
+                        logger.error("Error initializing OpenAI client: %s", e, exc_info=True)
+        return self.client
+    
+    def _get_async_client(self):
+        """Get the async OpenAI client for the running event loop, creating it on first use."""
+        if not self.is_available():
+            return None
+        try:
+            return self._async_clients.get()
+        except Exception as e:
+            logger.error("Error initializing OpenAI client: %s", e, exc_info=True)
+            return None
+    
+    def _create_async_client(self):
+        """Create an async OpenAI client (bound to the loop it's first used on)."""
+        import openai
+        return openai.AsyncOpenAI(api_key=self.api_key)
+    
+    @staticmethod
+    def _request_options(user: str = None) -> Dict:
+        """
+        Per-request options: the conversation id, if known.
         
-        if self.api_key:
-            try:
-                import openai
-                self.client = openai.OpenAI(api_key=self.api_key)
-            except ImportError:
-                print("OpenAI library not installed. Run: pip install openai")
-            except Exception as e:
-                print(f"Error initializing OpenAI client: {e}")
+        Requests share the static system prompt as their prefix, so OpenAI
+        serves it from its prompt cache (reported in
+        usage.prompt_tokens_details.cached_tokens).
+        """
+        return {"user": user} if user else {}
     
-    def generate(self, prompt: str, system_prompt: str = None) -> str:
+    def generate(self, prompt: str, system_prompt: str = None,
+                 user: str = None) -> str:
         """Generate response using OpenAI API."""
-        if not self.client:
+        client = self._get_client()
+        if not client:
             return None
         
         try:
-            messages = []
+            messages = self._build_messages(prompt, system_prompt)
             
-            if system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
+                **self._request_options(user)
+            )
             
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
+            return response.choices[0].message.content.strip()
+        
+        except Exception as e:
+            logger.error("OpenAI API Error: %s", e, exc_info=True)
+            return None
+    
+    async def generate_async(self, prompt: str, system_prompt: str = None,
+                             user: str = None) -> Optional[str]:
+        """Generate response using OpenAI's async client."""
+        async_client = self._get_async_client()
+        if not async_client:
+            return None
+        
+        try:
+            messages = self._build_messages(prompt, system_prompt)
             
-            response = self.client.chat.completions.create(
+            response = await async_client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 max_tokens=MAX_TOKENS,
-                temperature=TEMPERATURE
+                temperature=TEMPERATURE,
+                **self._request_options(user)
             )
             
             return response.choices[0].message.content.strip()
         
         except Exception as e:
-            print(f"OpenAI API Error: {e}")
+            logger.error("OpenAI API Error: %s", e, exc_info=True)
             return None
     
+    def generate_stream(self, prompt: str, system_prompt: str = None,
+                        user: str = None) -> Iterator[str]:
+        """Stream response chunks from OpenAI API."""
+        client = self._get_client()
+        if not client:
+            return
+        
+        try:
+            messages = self._build_messages(prompt, system_prompt)
+            
+            # Closing the stream releases its pooled connection even when the
+            # caller stops reading early
+            with client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
+                stream=True,
+                **self._request_options(user)
+            ) as stream:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        
+        except Exception as e:
+            logger.error("OpenAI API Error: %s", e, exc_info=True)
+    
     def is_available(self) -> bool:
-        """Check if OpenAI is available."""
-        return self.client is not None
+        """Check if OpenAI is configured (an API key is set and the SDK is installed)."""
+        return bool(self.api_key) and _sdk_installed("openai")
     
     @property
     def name(self) -> str:
@@ -208,53 +564,270 @@ class HuggingFaceProvider(BaseLLMProvider):
         self.model = model or HUGGINGFACE_MODEL
         self.api_url = f"https://api-inference.huggingface.co/models/{self.model}"
         self.headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        self.session = None
+        self._session_lock = threading.Lock()
+        self._async_clients = _LoopLocalClients(self._create_async_client)
+        # Circuit breaker: after repeated failures, calls return None without
+        # touching the network until the cooldown ends. Sync calls run in
+        # worker threads, so the state is guarded by its own lock
+        self._circuit_lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+        self._prewarm_started = False
+    
+    def prewarm(self):
+        """
+        Open the pooled connection (TCP + TLS) in the background.
+        
+        Called by LLMProviderFactory.create() when HuggingFace is selected,
+        so the first generate doesn't pay for the handshake. Runs at most
+        once; disabled with HF_PREWARM=false.
+        """
+        with self._session_lock:
+            if self._prewarm_started or not (self.api_key and HF_PREWARM):
+                return
+            self._prewarm_started = True
+        threading.Thread(target=self._prewarm, name="hf-prewarm", daemon=True).start()
+    
+    def _prewarm(self):
+        """Open a pooled connection to the Inference API ahead of the first request."""
+        try:
+            self._get_session().head(self.api_url, timeout=HF_TIMEOUT)
+        except Exception:
+            # Best effort only; generate() opens its own connection if needed
+            pass
     
-    def generate(self, prompt: str, system_prompt: str = None) -> str:
+    def _get_session(self):
+        """
+        Get the keep-alive session for the Inference API, creating it on first use.
+        
+        Requests is imported here so other providers don't pay for it.
+        Rate limits, gateway errors, model loading and failed connects are
+        retried with exponential backoff (honouring Retry-After); the final
+        response is returned either way so status handling stays in
+        generate(). Read timeouts are never retried: the POST isn't
+        idempotent, and each attempt could block the turn for the full
+        read timeout.
+        """
+        with self._session_lock:
+            if self.session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                retry_options = dict(
+                    total=HF_MAX_RETRIES,
+                    connect=HF_MAX_RETRIES,
+                    read=0,
+                    backoff_factor=HF_RETRY_BACKOFF,
+                    status_forcelist=HF_RETRY_STATUSES,
+                    allowed_methods=frozenset({"POST"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+                try:
+                    # Jitter spreads out retries from concurrent sessions (urllib3 2+)
+                    retry = Retry(backoff_jitter=HF_RETRY_BACKOFF, **retry_options)
+                except TypeError:
+                    retry = Retry(**retry_options)
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(
+                    pool_connections=HF_POOL_CONNECTIONS,
+                    pool_maxsize=HF_POOL_MAXSIZE,
+                    max_retries=retry
+                ))
+                session.headers.update(self.headers)
+                self.session = session
+            return self.session
+    
+    def generate(self, prompt: str, system_prompt: str = None,
+                 user: str = None) -> str:
         """Generate response using HuggingFace Inference API."""
-        if not self.api_key:
+        if not self.api_key or self._circuit_is_open():
             return None
         
         try:
-            # Format prompt for instruction-following models
-            if system_prompt:
-                full_prompt = f"""<s>[INST] {system_prompt}
-
-{prompt} [/INST]"""
-            else:
-                full_prompt = f"<s>[INST] {prompt} [/INST]"
-            
-            payload = {
-                "inputs": full_prompt,
-                "parameters": {
-                    "max_new_tokens": MAX_TOKENS,
-                    "temperature": TEMPERATURE,
-                    "top_p": TOP_P,
-                    "do_sample": True,
-                    "return_full_text": False
-                }
-            }
-            
-            response = requests.post(
+            response = self._get_session().post(
                 self.api_url,
-                headers=self.headers,
-                json=payload,
-                timeout=60
+                json=self._build_payload(prompt, system_prompt),
+                timeout=HF_TIMEOUT
             )
+            result = self._parse_response(response)
+        
+        except Exception as e:
+            logger.error("HuggingFace API Error: %s", e, exc_info=True)
+            result = None
+        
+        self._record_outcome(result is not None)
+        return result
+    
+    async def generate_async(self, prompt: str, system_prompt: str = None,
+                             user: str = None) -> Optional[str]:
+        """Generate response using HuggingFace Inference API without blocking."""
+        if not self.api_key or self._circuit_is_open():
+            return None
+        
+        try:
+            client = self._get_async_client()
+            payload = self._build_payload(prompt, system_prompt)
+            for attempt in range(HF_MAX_RETRIES + 1):
+                response = await client.post(self.api_url, json=payload)
+                if response.status_code not in HF_RETRY_STATUSES or attempt == HF_MAX_RETRIES:
+                    break
+                await asyncio.sleep(self._retry_delay(attempt, response))
+            result = self._parse_response(response)
+        
+        except Exception as e:
+            logger.error("HuggingFace API Error: %s", e, exc_info=True)
+            result = None
+        
+        self._record_outcome(result is not None)
+        return result
+    
+    def generate_stream(self, prompt: str, system_prompt: str = None,
+                        user: str = None) -> Iterator[str]:
+        """Stream response tokens from the Inference API (server-sent events)."""
+        if not self.api_key or self._circuit_is_open():
+            return
+        
+        succeeded = False
+        try:
+            payload = self._build_payload(prompt, system_prompt)
+            payload["stream"] = True
             
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    return result[0].get("generated_text", "").strip()
-                return str(result).strip()
-            elif response.status_code == 503:
-                # Model is loading
-                return None
-            else:
-                print(f"HuggingFace API Error: {response.status_code} - {response.text}")
-                return None
+            with self._get_session().post(
+                self.api_url,
+                json=payload,
+                timeout=HF_TIMEOUT,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    # 503 means the model is loading; anything else is an error
+                    if response.status_code != 503:
+                        logger.error("HuggingFace API Error: %s - %s", response.status_code, response.text)
+                    return
+                
+                # Succeeded once text arrives (a consumer may stop reading
+                # early); an empty reply lets the caller fall back instead
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    if "error" in event:
+                        # The API reports failures mid-stream as error events
+                        logger.error("HuggingFace API Error: %s", event["error"])
+                        succeeded = False
+                        return
+                    token = event.get("token") or {}
+                    if token.get("text") and not token.get("special"):
+                        succeeded = True
+                        yield token["text"]
         
         except Exception as e:
-            print(f"HuggingFace API Error: {e}")
+            logger.error("HuggingFace API Error: %s", e, exc_info=True)
+            succeeded = False
+        
+        finally:
+            self._record_outcome(succeeded)
+    
+    def _circuit_is_open(self) -> bool:
+        """Check whether recent failures mean the API should be skipped for now."""
+        with self._circuit_lock:
+            return time.monotonic() < self._circuit_open_until
+    
+    def _record_outcome(self, succeeded: bool):
+        """Track consecutive failures, opening the circuit once they reach the threshold."""
+        with self._circuit_lock:
+            if succeeded:
+                self._consecutive_failures = 0
+                return
+            
+            self._consecutive_failures += 1
+            opened = self._consecutive_failures >= HF_CIRCUIT_FAILURE_THRESHOLD
+            if opened:
+                self._consecutive_failures = 0
+                self._circuit_open_until = time.monotonic() + HF_CIRCUIT_COOLDOWN
+        if opened:
+            logger.warning("HuggingFace API failing; skipping it for %ss", HF_CIRCUIT_COOLDOWN)
+    
+    @staticmethod
+    def _retry_delay(attempt: int, response) -> float:
+        """
+        Seconds to wait before retrying a request.
+        
+        Uses the Retry-After header when the API sends one, otherwise
+        exponential backoff with full jitter.
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return random.uniform(0, HF_RETRY_BACKOFF * (2 ** attempt))
+    
+    def _get_async_client(self):
+        """
+        Get the async HTTP client for the current event loop.
+        
+        An httpx.AsyncClient's connections belong to the loop it runs on, so
+        each loop gets its own client, closed when that loop shuts down.
+        """
+        return self._async_clients.get()
+    
+    def _create_async_client(self):
+        """Create the httpx client for async Inference API calls."""
+        import httpx
+        return httpx.AsyncClient(
+            http2=_http2_available(),
+            headers=self.headers,
+            limits=httpx.Limits(max_keepalive_connections=HF_POOL_MAXSIZE),
+            timeout=httpx.Timeout(HF_TIMEOUT[1], connect=HF_TIMEOUT[0])
+        )
+    
+    @staticmethod
+    def _build_payload(prompt: str, system_prompt: str = None) -> Dict:
+        """Build the Inference API request body."""
+        # Format prompt for instruction-following models
+        if system_prompt:
+            full_prompt = f"""<s>[INST] {system_prompt}
+
+{prompt} [/INST]"""
+        else:
+            full_prompt = f"<s>[INST] {prompt} [/INST]"
+        
+        return {
+            "inputs": full_prompt,
+            "parameters": {
+                "max_new_tokens": MAX_TOKENS,
+                "temperature": TEMPERATURE,
+                "top_p": TOP_P,
+                "do_sample": True,
+                "return_full_text": False
+            }
+        }
+    
+    @staticmethod
+    def _parse_response(response) -> Optional[str]:
+        """
+        Extract the generated text from an Inference API response.
+        
+        Args:
+            response: requests or httpx response (same interface here)
+            
+        Returns:
+            str: Generated text (None if the call failed)
+        """
+        if response.status_code == 200:
+            result = response.json()
+            if isinstance(result, list) and len(result) > 0:
+                return result[0].get("generated_text", "").strip()
+            return str(result).strip()
+        elif response.status_code == 503:
+            # Model is loading
+            return None
+        else:
+            logger.error("HuggingFace API Error: %s - %s", response.status_code, response.text)
             return None
     
     def is_available(self) -> bool:
@@ -276,7 +849,8 @@ class FallbackProvider(BaseLLMProvider):
         """Initialize fallback provider."""
         pass
     
-    def generate(self, prompt: str, system_prompt: str = None) -> str:
+    def generate(self, prompt: str, system_prompt: str = None,
+                 user: str = None) -> str:
         """Return None to trigger fallback responses in chatbot."""
         return None
     
@@ -289,6 +863,100 @@ class FallbackProvider(BaseLLMProvider):
         return "Fallback (No API)"
 
 
+class CachedProvider(BaseLLMProvider):
+    """
+    Wraps a provider with an exact-match response cache.
+    
+    Requests are keyed on the model, both prompts and the sampling
+    parameters, so a hit returns exactly what the API would. That only
+    holds for deterministic sampling; LLMProviderFactory applies the
+    wrapper when LLM_CACHE_ENABLED is set.
+    """
+    
+    def __init__(self, provider: BaseLLMProvider, cache: ResponseCache):
+        """
+        Initialize the caching wrapper.
+        
+        Args:
+            provider: Provider that makes the actual calls
+            cache: Cache to store responses in
+        """
+        self.provider = provider
+        self.cache = cache
+    
+    @property
+    def model(self) -> str:
+        return getattr(self.provider, "model", "")
+    
+    def cache_key(self, prompt: str, system_prompt: str = None) -> str:
+        """
+        Build the cache key for a request.
+        
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt for context
+            
+        Returns:
+            str: SHA-256 hex digest identifying the request
+        """
+        request = json.dumps({
+            "provider": self.provider.name,
+            "model": self.model,
+            "sys": system_prompt,
+            "prompt": prompt,
+            "t": TEMPERATURE,
+            "p": TOP_P,
+            "m": MAX_TOKENS
+        }, sort_keys=True)
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+    
+    def generate(self, prompt: str, system_prompt: str = None,
+                 user: str = None) -> str:
+        """Return the cached response, calling the provider on a miss."""
+        key = self.cache_key(prompt, system_prompt)
+        response = self.cache.get(key)
+        if response is None:
+            response = self.provider.generate(prompt, system_prompt, user)
+            if response is not None:
+                self.cache.put(key, response)
+        return response
+    
+    async def generate_async(self, prompt: str, system_prompt: str = None,
+                             user: str = None) -> Optional[str]:
+        """Async variant of generate."""
+        key = self.cache_key(prompt, system_prompt)
+        response = self.cache.get(key)
+        if response is None:
+            response = await self.provider.generate_async(prompt, system_prompt, user)
+            if response is not None:
+                self.cache.put(key, response)
+        return response
+    
+    def generate_stream(self, prompt: str, system_prompt: str = None,
+                        user: str = None) -> Iterator[str]:
+        """Yield the cached response whole, or stream and cache it on a miss."""
+        key = self.cache_key(prompt, system_prompt)
+        response = self.cache.get(key)
+        if response is not None:
+            yield response
+            return
+        
+        chunks = []
+        for chunk in self.provider.generate_stream(prompt, system_prompt, user):
+            chunks.append(chunk)
+            yield chunk
+        
+        if chunks:
+            self.cache.put(key, "".join(chunks))
+    
+    def is_available(self) -> bool:
+        return self.provider.is_available()
+    
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+
 class LLMProviderFactory:
     """
     Factory class to create and manage LLM providers.
@@ -303,6 +971,14 @@ class LLMProviderFactory:
         LLMProvider.HUGGINGFACE.value: HuggingFaceProvider,
     }
     
+    # Shared by every cached provider; created on first use
+    _llm_cache: Optional[ResponseCache] = None
+    
+    # One instance per provider for the app lifetime, so SDK clients and
+    # their connection pools are reused; the lock guards first construction
+    _instances: Dict[str, BaseLLMProvider] = {}
+    _instances_lock = threading.Lock()
+    
     @classmethod
     def create(cls, provider: str = None) -> BaseLLMProvider:
         """
@@ -319,22 +995,67 @@ class LLMProviderFactory:
             provider = get_available_provider()
         
         if provider in cls._providers:
-            instance = cls._providers[provider]()
+            instance = cls._get_instance(provider)
             if instance.is_available():
-                return instance
+                return cls._select(instance)
         
         # Try all providers in priority order
-        for prov_name in [LLMProvider.GROQ.value, 
-                          LLMProvider.OPENAI.value, 
-                          LLMProvider.HUGGINGFACE.value]:
+        for prov_name in PROVIDER_PRIORITY:
             if prov_name in cls._providers:
-                instance = cls._providers[prov_name]()
+                instance = cls._get_instance(prov_name)
                 if instance.is_available():
-                    return instance
+                    return cls._select(instance)
         
         # Return fallback if nothing else works
         return FallbackProvider()
     
+    @classmethod
+    def _get_instance(cls, name: str) -> BaseLLMProvider:
+        """Return the shared instance of a provider, constructing it on first use."""
+        instance = cls._instances.get(name)
+        if instance is None:
+            with cls._instances_lock:
+                instance = cls._instances.get(name)
+                if instance is None:
+                    instance = cls._providers[name]()
+                    cls._instances[name] = instance
+        return instance
+    
+    @classmethod
+    def _select(cls, instance: BaseLLMProvider) -> BaseLLMProvider:
+        """Prewarm the chosen provider and wrap it for use."""
+        instance.prewarm()
+        return cls._with_cache(instance)
+    
+    @classmethod
+    def _with_cache(cls, instance: BaseLLMProvider) -> BaseLLMProvider:
+        """Wrap a provider in the response cache when caching is enabled."""
+        if not LLM_CACHE_ENABLED:
+            return instance
+        if cls._llm_cache is None:
+            cls._llm_cache = ResponseCache(LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL)
+        return CachedProvider(instance, cls._llm_cache)
+    
+    @staticmethod
+    async def gather(provider: BaseLLMProvider, prompts: List[str],
+                     system_prompt: str = None) -> List[Optional[str]]:
+        """
+        Run several prompts concurrently on one provider.
+        
+        Total time is that of the slowest call rather than the sum of all.
+        
+        Args:
+            provider: Provider to send the prompts to
+            prompts: User prompts
+            system_prompt: Optional system prompt shared by every call
+            
+        Returns:
+            list: Responses in prompt order (None where a call failed)
+        """
+        return list(await asyncio.gather(
+            *(provider.generate_async(prompt, system_prompt) for prompt in prompts)
+        ))
+    
     @classmethod
     def get_available_providers(cls) -> List[Dict[str, str]]:
         """
@@ -345,8 +1066,8 @@ class LLMProviderFactory:
         """
         available = []
         
-        for name, provider_class in cls._providers.items():
-            instance = provider_class()
+        for name in cls._providers:
+            instance = cls._get_instance(name)
             available.append({
                 "name": name,
                 "display_name": instance.name,
@@ -2,8 +2,46 @@
 Prompt templates for the TalentScout Hiring Assistant
 """
 
-# System prompt that defines the chatbot's behavior
-SYSTEM_PROMPT = """You are an intelligent and professional Hiring Assistant for TalentScout, 
+from string import Formatter
+from typing import Callable
+
+
+def compile_template(template: str) -> Callable[..., str]:
+    """
+    Parse a str.format() template once into a render function.
+    
+    The template is split into (literal, field) segments up front, so
+    rendering just joins them without re-parsing the format string.
+    Output is identical to template.format(**fields).
+    
+    Args:
+        template: Template with plain {field} placeholders (no format specs
+                 or conversions)
+        
+    Returns:
+        Callable: Function rendering the template from keyword arguments
+    """
+    segments = []
+    for literal, field, format_spec, conversion in Formatter().parse(template):
+        if field is not None and (format_spec or conversion or not field.isidentifier()):
+            raise ValueError(f"Unsupported placeholder in prompt template: {{{field}}}")
+        segments.append((literal, field))
+    segments = tuple(segments)
+    
+    def render(**fields) -> str:
+        return "".join([
+            literal + format(fields[field]) if field is not None else literal
+            for literal, field in segments
+        ])
+    
+    return render
+
+
+# System prompt that defines the chatbot's behavior. The static part comes
+# first and is never formatted, so every request shares the same prefix and
+# providers with automatic prompt caching can reuse it; the per-turn state
+# goes in the suffix.
+SYSTEM_PROMPT_STATIC = """You are an intelligent and professional Hiring Assistant for TalentScout, 
 a recruitment agency specializing in technology placements. Your role is to:
 
 1. Greet candidates warmly and professionally
@@ -19,9 +57,9 @@ Important guidelines:
 - Validate information where possible (e.g., email format)
 - Be encouraging and supportive
 - Never share or discuss other candidates' information
-- Handle sensitive data with care
+- Handle sensitive data with care"""
 
-Current conversation state: {state}
+SYSTEM_PROMPT_DYNAMIC_SUFFIX = """Current conversation state: {state}
 Candidate information collected so far: {candidate_info}
 """
 
@@ -80,7 +118,10 @@ Years of experience: {experience}
 
 Generate questions appropriate for their experience level."""
 
-# Follow-up prompt for technical questions
+# Follow-up prompt for technical questions. Not used by the chatbot: all
+# questions come from one GENERATE_QUESTIONS_PROMPT call and are served
+# from HiringAssistant.question_messages with a static acknowledgment, so
+# answering a question never costs an LLM round-trip.
 FOLLOWUP_QUESTION_PROMPT = """The candidate answered: "{answer}"
 
 This was for the question about {topic}.
@@ -112,4 +153,15 @@ OFFTOPIC_REDIRECT_PROMPT = """The user seems to be going off-topic with: "{user_
 
 Politely acknowledge their message but redirect them back to the screening process.
 Current stage: {state}
-Remind them what information is needed next."""
\ No newline at end of file
+Remind them what information is needed next."""
+
+# Static system prompt plus its separator, joined once at import
+SYSTEM_PROMPT_PREFIX = SYSTEM_PROMPT_STATIC + "\n\n"
+
+# Pre-parsed renderers for the templates formatted on every turn
+FMT_SYSTEM_PROMPT_DYNAMIC_SUFFIX = compile_template(SYSTEM_PROMPT_DYNAMIC_SUFFIX)
+FMT_COLLECT_EMAIL = compile_template(COLLECT_EMAIL_PROMPT)
+FMT_COLLECT_PHONE = compile_template(COLLECT_PHONE_PROMPT)
+FMT_COLLECT_POSITION = compile_template(COLLECT_POSITION_PROMPT)
+FMT_COLLECT_LOCATION = compile_template(COLLECT_LOCATION_PROMPT)
+FMT_GENERATE_QUESTIONS = compile_template(GENERATE_QUESTIONS_PROMPT)
\ No newline at end of file
@@ -0,0 +1,272 @@
+"""
+Response cache for TalentScout Hiring Assistant
+Stores LLM output that is safe to share between candidates
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Hashable, Optional
+
+from utils import dumps_json, loads_json
+
+logger = logging.getLogger("talentscout.cache")
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of LLM responses, optionally persisted to a JSON Lines file.
+
+    Keys are SHA-1 digests of their parts, so prompts of any size map to a
+    short, file-friendly key. Values must be JSON-serializable.
+
+    Each put appends one [key, value] line, so storing a response never
+    rewrites the file. The file is compacted to the live entries on load,
+    and again whenever it grows to twice max_entries lines.
+    """
+
+    def __init__(self, max_entries: int, filename: Optional[str] = None,
+                 ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses to keep
+            filename: Optional JSONL file to persist entries across restarts
+            ttl: Optional lifetime of an entry in seconds (in memory only;
+                 persisted entries never expire)
+        """
+        self.max_entries = max_entries
+        self.filename = filename
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._expires_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        # Serializes appends and compaction; never taken while holding _lock
+        self._file_lock = threading.Lock()
+        self._file_lines = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from its parts.
+
+        Args:
+            parts: Values identifying the response (provider, model, prompt, ...)
+
+        Returns:
+            str: Hex digest of the joined parts
+        """
+        joined = "\x1f".join(str(part) for part in parts)
+        return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """
+        Look up a response, marking it as recently used.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            self._ensure_loaded()
+            value = self._entries.get(key)
+            if value is None:
+                return None
+
+            expires_at = self._expires_at.get(key)
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                del self._expires_at[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any):
+        """
+        Store a response, evicting the least recently used beyond the limit.
+
+        Args:
+            key: Key from make_key()
+            value: JSON-serializable response
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if self.ttl is not None:
+                self._expires_at[key] = time.monotonic() + self.ttl
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._expires_at.pop(evicted, None)
+
+        if self.filename:
+            self._append(key, value)
+
+    def _ensure_loaded(self):
+        """Load persisted entries on first use, compacting the file."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not self.filename or not os.path.exists(self.filename):
+            return
+
+        try:
+            with open(self.filename, 'rb') as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            logger.warning("Could not load response cache, starting fresh: %s", e)
+            return
+
+        for line in lines:
+            try:
+                key, value = loads_json(line)
+            except (ValueError, TypeError):
+                # Blank, or cut short by a crash mid-write
+                continue
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        # Nothing has been appended yet (every put loads first, under
+        # _lock), so the file can be rewritten without _file_lock
+        self._file_lines = len(lines)
+        if self._file_lines > len(self._entries):
+            self._save(list(self._entries.items()))
+
+    def _append(self, key: str, value: Any):
+        """Append one entry to the file, compacting it once it has grown too long."""
+        try:
+            line = dumps_json([key, value]) + "\n"
+        except TypeError as e:
+            logger.error("Error saving response cache: %s", e)
+            return
+
+        with self._file_lock:
+            try:
+                os.makedirs(os.path.dirname(self.filename) or ".", exist_ok=True)
+                with open(self.filename, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                self._file_lines += 1
+            except OSError as e:
+                logger.error("Error saving response cache: %s", e)
+                return
+
+            if self._file_lines > 2 * self.max_entries:
+                with self._lock:
+                    entries = list(self._entries.items())
+                self._save(entries)
+
+    def _save(self, entries):
+        """Rewrite the file with just the given (key, value) entries, atomically."""
+        try:
+            os.makedirs(os.path.dirname(self.filename) or ".", exist_ok=True)
+            tmp_filename = f"{self.filename}.tmp"
+            with open(tmp_filename, 'w', encoding='utf-8') as f:
+                f.writelines(dumps_json([key, value]) + "\n" for key, value in entries)
+            os.replace(tmp_filename, self.filename)
+            self._file_lines = len(entries)
+        except (OSError, TypeError) as e:
+            logger.error("Error saving response cache: %s", e)
+
+
+class SemanticCache:
+    """
+    Cache of responses looked up by meaning rather than exact text.
+
+    Texts are embedded with a small local sentence-transformers model and
+    compared by cosine similarity, so rewordings of the same request hit.
+    Entries are grouped by an exact-match namespace; only texts in the same
+    namespace are compared. Only use it for responses that are safe to
+    share between candidates.
+
+    If sentence-transformers isn't installed, every lookup misses.
+    """
+
+    def __init__(self, model_name: str, threshold: float, max_entries: int):
+        """
+        Initialize the cache; the model is loaded on first use.
+
+        Args:
+            model_name: sentence-transformers model used for embeddings
+            threshold: Minimum cosine similarity for a hit (0-1)
+            max_entries: Maximum number of entries, oldest evicted first
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self._entries: deque = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self._model = None
+        self._model_loaded = False
+
+    def get(self, namespace: Hashable, text: str) -> Any:
+        """
+        Find the cached value for the most similar text in a namespace.
+
+        Args:
+            namespace: Exact-match part of the key (e.g. provider, model)
+            text: Text compared by meaning
+
+        Returns:
+            The cached value, or None if nothing is similar enough
+        """
+        vector = self._embed(text)
+        if vector is None:
+            return None
+
+        with self._lock:
+            best_score, best_value = self.threshold, None
+            for entry_namespace, entry_vector, value in self._entries:
+                if entry_namespace != namespace:
+                    continue
+                # Vectors are L2-normalized, so the dot product is the cosine
+                score = float(entry_vector @ vector)
+                if score >= best_score:
+                    best_score, best_value = score, value
+            return best_value
+
+    def put(self, namespace: Hashable, text: str, value: Any):
+        """
+        Store a value under a text, evicting the oldest beyond the limit.
+
+        Args:
+            namespace: Exact-match part of the key
+            text: Text compared by meaning
+            value: Value to return for similar texts
+        """
+        vector = self._embed(text)
+        if vector is None:
+            return
+
+        with self._lock:
+            self._entries.append((namespace, vector, value))
+
+    def _embed(self, text: str):
+        """Embed text as an L2-normalized vector (None if no model is available)."""
+        model = self._get_model()
+        if model is None:
+            return None
+        return model.encode(text, normalize_embeddings=True, convert_to_numpy=True)
+
+    def _get_model(self):
+        """Load the embedding model once, on first use."""
+        with self._lock:
+            if not self._model_loaded:
+                self._model_loaded = True
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name, device="cpu")
+                except ImportError:
+                    logger.warning("sentence-transformers not installed; semantic cache disabled")
+                except Exception as e:
+                    logger.error("Could not load embedding model %s: %s", self.model_name, e)
+            return self._model
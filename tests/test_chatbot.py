@@ -0,0 +1,35 @@
+"""
+Regression checks for the chatbot's offline fallbacks
+"""
+
+import pytest
+
+from chatbot import FALLBACK_BUCKETS, FALLBACK_PATTERN
+
+
+def _found(text):
+    """Fallback bucket keywords found in text, lowercased."""
+    return {match.group(1).lower() for match in FALLBACK_PATTERN.finditer(text)}
+
+
+@pytest.mark.parametrize("text, keyword", [
+    ("Python3", "python"),
+    ("MySQL8", "mysql"),
+    ("PyTorch2", "pytorch"),
+    ("ReactJS", "react"),
+    ("node.js", "node"),
+    ("SQLite3", "sqlite"),
+])
+def test_fallback_pattern_accepts_suffixes(text, keyword):
+    assert keyword in _found(text)
+
+
+@pytest.mark.parametrize("text", ["javascript", "html", "xml"])
+def test_fallback_pattern_matches_whole_words(text):
+    assert not {"java", "ml"} & _found(text)
+
+
+@pytest.mark.parametrize("text", ["SQLite", "sqlite3", "MSSQL", "PostgreSQL"])
+def test_fallback_pattern_routes_sql_variants_to_databases(text):
+    database_keywords = next(keywords for keywords, _ in FALLBACK_BUCKETS if "sql" in keywords)
+    assert _found(text) & database_keywords
@@ -0,0 +1,79 @@
+"""
+Regression checks for the HuggingFace provider in llm_providers.py
+"""
+
+import json
+
+import pytest
+
+from llm_providers import HuggingFaceProvider
+
+
+class _FakeStreamResponse:
+    """Streamed Inference API response replaying the given SSE events."""
+    
+    status_code = 200
+    
+    def __init__(self, events):
+        self.lines = [f"data: {json.dumps(event)}" for event in events]
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def iter_lines(self, decode_unicode=False):
+        return iter(self.lines)
+
+
+class _FakeSession:
+    def __init__(self, events):
+        self.events = events
+    
+    def post(self, *args, **kwargs):
+        return _FakeStreamResponse(self.events)
+
+
+def _streaming_provider(events):
+    provider = HuggingFaceProvider(api_key="test")
+    provider._get_session = lambda: _FakeSession(events)
+    return provider
+
+
+def _token(text):
+    return {"token": {"text": text, "special": False}}
+
+
+def test_hf_session_does_not_retry_read_timeouts():
+    pytest.importorskip("requests.adapters")
+    pytest.importorskip("urllib3.util.retry")
+    provider = HuggingFaceProvider(api_key="test")
+    retry = provider._get_session().get_adapter(provider.api_url).max_retries
+    assert retry.read == 0
+    assert 503 in retry.status_forcelist
+
+
+@pytest.mark.parametrize("events", [
+    [{"error": "Model is overloaded"}],
+    [_token("Hi"), {"error": "Input validation error"}],
+    [],
+])
+def test_hf_stream_errors_count_as_failures(events):
+    provider = _streaming_provider(events)
+    list(provider.generate_stream("prompt"))
+    assert provider._consecutive_failures == 1
+
+
+def test_hf_stream_error_event_yields_nothing():
+    provider = _streaming_provider([{"error": "Model is overloaded"}])
+    assert list(provider.generate_stream("prompt")) == []
+
+
+def test_hf_stream_closed_early_counts_as_success():
+    provider = _streaming_provider([_token("Hi"), _token(" there")])
+    provider._consecutive_failures = 1
+    stream = provider.generate_stream("prompt")
+    assert next(stream) == "Hi"
+    stream.close()
+    assert provider._consecutive_failures == 0
@@ -0,0 +1,65 @@
+"""
+Regression checks for the persisted response cache in response_cache.py
+"""
+
+from response_cache import ResponseCache
+
+
+def _line_count(path):
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+
+def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "cache.jsonl")
+    cache = ResponseCache(4, path)
+    cache.put("a", "first")
+    cache.put("b", ["one", "two"])
+    cache.put("a", "updated")
+    
+    reloaded = ResponseCache(4, path)
+    assert reloaded.get("a") == "updated"
+    assert reloaded.get("b") == ["one", "two"]
+
+
+def test_each_put_appends_a_line(tmp_path):
+    path = str(tmp_path / "cache.jsonl")
+    cache = ResponseCache(4, path)
+    for i in range(3):
+        cache.put(str(i), i)
+        assert _line_count(path) == i + 1
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    cache = ResponseCache(4, str(path))
+    cache.put("a", "kept")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('["b", "cut sho')
+    
+    reloaded = ResponseCache(4, str(path))
+    assert reloaded.get("a") == "kept"
+    assert reloaded.get("b") is None
+
+
+def test_load_compacts_to_the_newest_entries(tmp_path):
+    path = str(tmp_path / "cache.jsonl")
+    cache = ResponseCache(2, path)
+    for i in range(4):
+        cache.put(str(i), i)
+    
+    reloaded = ResponseCache(2, path)
+    assert reloaded.get("0") is None
+    assert reloaded.get("3") == 3
+    assert _line_count(path) == 2
+
+
+def test_file_stays_bounded_without_restarts(tmp_path):
+    path = str(tmp_path / "cache.jsonl")
+    cache = ResponseCache(3, path)
+    for i in range(50):
+        cache.put(str(i % 5), i)
+        assert _line_count(path) <= 2 * 3
+    
+    reloaded = ResponseCache(3, path)
+    assert [reloaded.get(str(k)) for k in (2, 3, 4)] == [47, 48, 49]
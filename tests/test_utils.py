@@ -0,0 +1,45 @@
+"""
+Regression checks for tech stack extraction in utils.py
+"""
+
+import pytest
+
+import utils
+from utils import extract_tech_stack
+
+
+def _found(text):
+    """All technologies extracted from text, lowercased."""
+    return {tech.lower() for techs in extract_tech_stack(text).values() for tech in techs}
+
+
+@pytest.fixture(params=["automaton", "fallback"])
+def matcher(request, monkeypatch):
+    """Run each check with and without pyahocorasick."""
+    if request.param == "automaton" and utils._TECH_AUTOMATON is None:
+        pytest.skip("pyahocorasick not installed")
+    if request.param == "fallback":
+        monkeypatch.setattr(utils, "_TECH_AUTOMATON", None)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("python3", {"python"}),
+    ("Python3.11 and Java8", {"python", "java"}),
+    ("ReactJS, NodeJS", {"react", "node.js"}),
+    ("react.js", {"react"}),
+    ("Golang", {"go"}),
+    ("MySQL8, Vue3", {"mysql", "vue"}),
+    ("ASP.NET, C++, C#", {".net", "c++", "c#"}),
+])
+def test_variant_spellings_match(matcher, text, expected):
+    assert expected <= _found(text)
+
+
+@pytest.mark.parametrize("text, unexpected", [
+    ("django", {"go"}),
+    ("mongodb", {"go"}),
+    ("javascript", {"java"}),
+    ("ruby on rails", {"r"}),
+])
+def test_keywords_inside_other_words_dont_match(matcher, text, unexpected):
+    assert not unexpected & _found(text)
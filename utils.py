@@ -3,11 +3,115 @@ Utility functions for TalentScout Hiring Assistant
 """
 
 import re
+import hashlib
+import atexit
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import threading
+import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
-from config import EXIT_KEYWORDS, TECH_CATEGORIES
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from config import EXIT_KEYWORDS_SET, EXIT_PATTERN, LOG_LEVEL, TECH_CATEGORIES
+
+try:
+    import ahocorasick
+except ImportError:  # Optional; extract_tech_stack falls back to substring checks
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # Optional; JSON encoding falls back to the stdlib
+    orjson = None
+
+logger = logging.getLogger("talentscout.utils")
+
+# Background listener writing queued log records; started by configure_logging()
+_log_listener = None
+
+# Categories included in the extracted tech stack
+EXTRACTED_CATEGORIES = ("programming_languages", "frameworks", "databases", "tools")
+
+
+def configure_logging():
+    """
+    Route all "talentscout" log records through a queue to a background thread.
+    
+    Callers only put the record on the queue; formatting and the write to
+    stderr happen on the listener thread, so logging an error never blocks
+    an LLM call. Safe to call on every Streamlit rerun.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    
+    app_logger = logging.getLogger("talentscout")
+    app_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.propagate = False
+
+
+def _tech_spellings():
+    """
+    Yield (spelling, keyword) for every extracted tech keyword.
+    
+    Keywords ending in ".js" are also matched without the dot ("nodejs").
+    """
+    for category in EXTRACTED_CATEGORIES:
+        for tech in TECH_CATEGORIES[category]:
+            yield tech, tech
+            if tech.endswith(".js"):
+                yield tech[:-3] + "js", tech
+
+def _build_tech_automaton():
+    """
+    Build an Aho-Corasick automaton over the extracted tech keywords.
+    
+    Returns:
+        Automaton matching every keyword in one pass, or None if
+        pyahocorasick isn't installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for spelling, tech in _tech_spellings():
+        automaton.add_word(spelling, (spelling, tech))
+    automaton.make_automaton()
+    return automaton
+
+
+_TECH_AUTOMATON = _build_tech_automaton()
+
+# Serializes appends to the candidates file across sessions
+_candidates_lock = threading.Lock()
+
+# Digest of the last record appended to each candidates file, so saving the
+# same candidate info again doesn't write a duplicate line
+_last_saved_digests: Dict[str, str] = {}
+
+# Patterns used on every turn, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_SEPARATORS_RE = re.compile(r'[\s\-\(\)\+\.]')
+_DIGITS_RE = re.compile(r'\d+')
+_TECH_TOKEN_RE = re.compile(r'[a-z0-9+#.]+')
+# Suffixes that don't make a tech keyword part of another word: version
+# numbers ("python3", "python3.11") and "js"/"lang" spellings ("reactjs", "golang")
+_TECH_SUFFIX_RE = re.compile(r'\.?js|lang|\d+(?:\.\d+)*')
+# Kept as a regex: for typical chat-length input (and any non-ASCII text)
+# re.sub beats str.translate with a deletion table, which only wins on
+# long pure-ASCII strings
+_UNSAFE_CHARS_RE = re.compile(r'[<>{}[\]\\]')
 
 def validate_email(email: str) -> bool:
     """
@@ -19,8 +123,7 @@ def validate_email(email: str) -> bool:
     Returns:
         bool: True if valid email format, False otherwise
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email.strip()))
+    return bool(_EMAIL_RE.match(email.strip()))
 
 def validate_phone(phone: str) -> bool:
     """
@@ -33,7 +136,7 @@ def validate_phone(phone: str) -> bool:
         bool: True if valid phone format, False otherwise
     """
     # Remove common separators and check if remaining chars are digits
-    cleaned = re.sub(r'[\s\-\(\)\+\.]', '', phone)
+    cleaned = _PHONE_SEPARATORS_RE.sub('', phone)
     return len(cleaned) >= 10 and cleaned.isdigit()
 
 def validate_experience(experience: str) -> Optional[int]:
@@ -46,10 +149,10 @@ def validate_experience(experience: str) -> Optional[int]:
     Returns:
         int or None: Years of experience if found, None otherwise
     """
-    # Try to find numbers in the input
-    numbers = re.findall(r'\d+', experience)
-    if numbers:
-        years = int(numbers[0])
+    # Only the first number is used, so stop scanning once it's found
+    match = _DIGITS_RE.search(experience)
+    if match:
+        years = int(match.group())
         if 0 <= years <= 50:  # Reasonable range
             return years
     return None
@@ -64,8 +167,38 @@ def is_exit_command(text: str) -> bool:
     Returns:
         bool: True if exit command detected, False otherwise
     """
-    text_lower = text.lower().strip()
-    return any(keyword in text_lower for keyword in EXIT_KEYWORDS)
+    # Most exits are a bare keyword ("bye", "quit"), answered by one set lookup
+    if text.strip().lower() in EXIT_KEYWORDS_SET:
+        return True
+    return bool(EXIT_PATTERN.search(text))
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """
+    Check that text[start:end] isn't part of a longer word.
+    
+    Only edges that are alphanumeric need a boundary, so "go" doesn't match
+    inside "django" but ".net" still matches in "asp.net" and "c++" at any
+    following character. A version number or "js"/"lang" suffix may follow
+    the word ("python3", "reactjs", "golang").
+    """
+    if text[start].isalnum() and start > 0 and text[start - 1].isalnum():
+        return False
+    if text[end - 1].isalnum() and end < len(text) and text[end].isalnum():
+        suffix = _TECH_SUFFIX_RE.match(text, end)
+        if suffix is None:
+            return False
+        end = suffix.end()
+        return end == len(text) or not text[end].isalnum()
+    return True
+
+def _contains_word(text: str, word: str) -> bool:
+    """Check whether word occurs in text as a whole word (see _is_whole_word)."""
+    start = text.find(word)
+    while start != -1:
+        if _is_whole_word(text, start, start + len(word)):
+            return True
+        start = text.find(word, start + 1)
+    return False
 
 def extract_tech_stack(text: str) -> Dict[str, list]:
     """
@@ -78,74 +211,193 @@ def extract_tech_stack(text: str) -> Dict[str, list]:
         dict: Categorized tech stack
     """
     text_lower = text.lower()
-    extracted = {
-        "programming_languages": [],
-        "frameworks": [],
-        "databases": [],
-        "tools": []
+    
+    if _TECH_AUTOMATON is not None:
+        # One scan of the text finds every keyword
+        found = {
+            tech
+            for end, (spelling, tech) in _TECH_AUTOMATON.iter(text_lower)
+            if _is_whole_word(text_lower, end - len(spelling) + 1, end + 1)
+        }
+    else:
+        found = {
+            tech
+            for spelling, tech in _tech_spellings()
+            if _contains_word(text_lower, spelling)
+        }
+    
+    # Keep the configured keyword order within each category
+    return {
+        category: [tech.capitalize() for tech in TECH_CATEGORIES[category] if tech in found]
+        for category in EXTRACTED_CATEGORIES
     }
+
+def truncate_for_display(text: str, limit: int) -> str:
+    """
+    Shorten text for display, adding an ellipsis when it was cut.
     
-    for category, technologies in TECH_CATEGORIES.items():
-        # Only use first 4 categories for display
-        if category in extracted:
-            for tech in technologies:
-                if tech in text_lower:
-                    extracted[category].append(tech.capitalize())
+    Args:
+        text: Text to shorten
+        limit: Maximum number of characters to keep
+        
+    Returns:
+        str: Text of at most `limit` characters plus "..." if truncated
+    """
+    if text and len(text) > limit:
+        return text[:limit] + "..."
+    return text
+
+def normalize_tech_stack(text: str) -> str:
+    """
+    Normalize a tech stack description so equivalent stacks compare equal.
+    
+    Args:
+        text: User input describing their tech stack
+        
+    Returns:
+        str: Sorted, lowercased, comma-separated technology tokens
+    """
+    tokens = _TECH_TOKEN_RE.findall(text.lower())
+    return ','.join(sorted(set(tokens)))
+
+def dumps_json(data: Any, sort_keys: bool = False) -> str:
+    """
+    Serialize data to compact JSON, using orjson when it's installed.
+    
+    Args:
+        data: JSON-serializable value
+        sort_keys: Whether to sort object keys (for a canonical form)
+        
+    Returns:
+        str: JSON text (non-ASCII characters are kept as-is)
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, option=option).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys)
+
+def loads_json(content) -> Any:
+    """
+    Parse JSON text or bytes, using orjson when it's installed.
     
-    return extracted
+    Args:
+        content: JSON document as str or bytes
+        
+    Returns:
+        The decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
 
-def save_candidate_data(candidate_info: Dict[str, Any], filename: str = "data/candidates.json") -> bool:
+def save_candidate_data(candidate_info: Dict[str, Any], filename: str = "data/candidates.jsonl") -> bool:
     """
-    Save candidate information to JSON file (simulated database).
+    Save candidate information to a JSON Lines file (simulated database).
+    
+    Each candidate is appended as one line, so saving never reads or
+    rewrites earlier records. Saving info identical to the last record
+    written to the file is a no-op.
     
     Args:
         candidate_info: Dictionary containing candidate information
-        filename: Path to the JSON file
+        filename: Path to the JSONL file
         
     Returns:
         bool: True if save successful, False otherwise
     """
     try:
+        digest = hashlib.blake2b(
+            dumps_json(candidate_info, sort_keys=True).encode('utf-8'), digest_size=16
+        ).hexdigest()
+        if _last_saved_digests.get(filename) == digest:
+            return True
+        
         # Ensure directory exists
         os.makedirs(os.path.dirname(filename), exist_ok=True)
         
-        # Load existing data or create new list
-        data = []
+        # Add timestamp and ID without modifying the original
+        record = {
+            **candidate_info,
+            'timestamp': datetime.now().isoformat(),
+            'id': uuid.uuid4().hex
+        }
+        line = dumps_json(record) + "\n"
         
-        if os.path.exists(filename):
-            try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:  # Only parse if file is not empty
-                        data = json.loads(content)
-                        if not isinstance(data, list):
-                            data = []
-            except (json.JSONDecodeError, ValueError):
-                # If JSON is invalid, start fresh
-                print("Warning: Invalid JSON in candidates file, starting fresh.")
-                data = []
-        
-        # Create a copy of candidate_info to avoid modifying original
-        candidate_copy = candidate_info.copy()
-        
-        # Add timestamp and ID
-        candidate_copy['timestamp'] = datetime.now().isoformat()
-        candidate_copy['id'] = len(data) + 1
-        
-        # Append new candidate
-        data.append(candidate_copy)
-        
-        # Save back to file
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        print(f"Successfully saved candidate data. Total candidates: {len(data)}")
+        # Append-mode writes go to the end of the file; the lock keeps
+        # concurrent sessions from interleaving lines
+        with _candidates_lock:
+            if _last_saved_digests.get(filename) == digest:
+                return True
+            with open(filename, 'a', encoding='utf-8') as f:
+                f.write(line)
+            _last_saved_digests[filename] = digest
+        
+        logger.info("Successfully saved candidate data (id %s).", record['id'])
         return True
         
     except Exception as e:
-        print(f"Error saving candidate data: {e}")
+        logger.error("Error saving candidate data: %s", e, exc_info=True)
         return False
 
+def load_candidates(filename: str = "data/candidates.jsonl") -> List[Dict[str, Any]]:
+    """
+    Load every candidate record saved by save_candidate_data.
+    
+    Args:
+        filename: Path to the JSONL file
+        
+    Returns:
+        list: Candidate records in the order they were saved (empty if the
+              file doesn't exist yet)
+    """
+    if not os.path.exists(filename):
+        return []
+    
+    candidates = []
+    with _candidates_lock, open(filename, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                candidates.append(loads_json(line))
+            except ValueError as e:
+                # A crash mid-append can leave a truncated last line
+                logger.warning("Skipping malformed candidate record on line %d: %s", line_number, e)
+    return candidates
+
+# Mask strings for every length an email username or phone number
+# realistically has, built once instead of on every call
+_MASKS = tuple('*' * length for length in range(64))
+
+def _mask(length: int) -> str:
+    """Return a run of `length` mask characters."""
+    return _MASKS[length] if length < len(_MASKS) else '*' * length
+
+def _mask_email(data: str) -> str:
+    """Mask the username part of an email, keeping its first and last character."""
+    parts = data.split('@')
+    if len(parts) != 2:
+        return data
+    username = parts[0]
+    if len(username) > 2:
+        masked_username = username[0] + _mask(len(username) - 2) + username[-1]
+    else:
+        masked_username = username[0] + '*'
+    return f"{masked_username}@{parts[1]}"
+
+def _mask_phone(data: str) -> str:
+    """Mask all but the last four digits of a phone number."""
+    if len(data) < 4:
+        return data
+    return _mask(len(data) - 4) + data[-4:]
+
+# Masking function for each supported data type
+_MASKERS = {
+    'email': _mask_email,
+    'phone': _mask_phone,
+}
+
+@lru_cache(maxsize=512)
 def mask_sensitive_data(data: str, data_type: str) -> str:
     """
     Mask sensitive data for display purposes.
@@ -159,21 +411,9 @@ def mask_sensitive_data(data: str, data_type: str) -> str:
     """
     if not data:
         return ""
-        
-    if data_type == 'email':
-        parts = data.split('@')
-        if len(parts) == 2:
-            username = parts[0]
-            if len(username) > 2:
-                masked_username = username[0] + '*' * (len(username) - 2) + username[-1]
-            else:
-                masked_username = username[0] + '*'
-            return f"{masked_username}@{parts[1]}"
-    elif data_type == 'phone':
-        if len(data) >= 4:
-            return '*' * (len(data) - 4) + data[-4:]
-    
-    return data
+    
+    masker = _MASKERS.get(data_type)
+    return masker(data) if masker else data
 
 def format_tech_stack_display(tech_stack: Dict[str, list]) -> str:
     """
@@ -187,7 +427,15 @@ def format_tech_stack_display(tech_stack: Dict[str, list]) -> str:
     """
     if not tech_stack:
         return "No specific technologies identified"
-        
+    
+    # Convert to a hashable form so repeated renders hit the cache
+    return _format_tech_stack_items(
+        tuple((category, tuple(techs)) for category, techs in tech_stack.items())
+    )
+
+@lru_cache(maxsize=256)
+def _format_tech_stack_items(tech_stack: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> str:
+    """Format (category, technologies) pairs for display."""
     lines = []
     category_names = {
         "programming_languages": "💻 Languages",
@@ -196,7 +444,7 @@ def format_tech_stack_display(tech_stack: Dict[str, list]) -> str:
         "tools": "🛠️ Tools"
     }
     
-    for category, techs in tech_stack.items():
+    for category, techs in tech_stack:
         if techs and category in category_names:
             name = category_names[category]
             lines.append(f"{name}: {', '.join(techs)}")
@@ -216,6 +464,6 @@ def sanitize_input(text: str) -> str:
     if not text:
         return ""
     # Remove potentially harmful characters
-    sanitized = re.sub(r'[<>{}[\]\\]', '', text)
+    sanitized = _UNSAFE_CHARS_RE.sub('', text)
     # Limit length
     return sanitized[:1000].strip()
\ No newline at end of file